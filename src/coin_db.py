@@ -1,98 +1,321 @@
+import asyncio
+import shutil
+import numpy as np
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.dataset as ds
 import duckdb
-from deltalake import write_deltalake
+from deltalake import ColumnProperties, DeltaTable, WriterProperties, write_deltalake
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import AsyncGenerator, Dict, List
+from typing import AsyncGenerator, Dict, List, Sequence, Tuple
 from utils.loggers.logger import logger_manger
 
+FLUSH_ROWS = 500_000  # Rows buffered per symbol before they are committed to Delta Lake
+ROW_GROUP_ROWS = 1_048_576  # Large row groups keep the min/max statistics per group meaningful
+
+# Prices and timestamps rarely repeat, a dictionary would be built only to be abandoned for the fallback encoding
+COLUMN_PROPERTIES = ColumnProperties(dictionary_enabled=False)
+
+# Page level statistics on the time columns let readers skip pages outside a queried range, not just row groups
+TIME_COLUMN_PROPERTIES = ColumnProperties(dictionary_enabled=False, statistics_enabled="PAGE")
+WRITER_PROPERTIES = WriterProperties(
+    compression="ZSTD",  # Smaller files than the default snappy at similar speed
+    compression_level=3,
+    max_row_group_size=ROW_GROUP_ROWS,
+    default_column_properties=COLUMN_PROPERTIES,
+    column_properties={"time": TIME_COLUMN_PROPERTIES, "timestamp": TIME_COLUMN_PROPERTIES}
+)
+
+CANDLE_COLUMNS = ("time", "low", "high", "open", "close", "volume", "timestamp", "year", "month")  # Schema of every Delta table
+
+# The year/month predicate only touches hive partition columns, letting DuckDB prune whole partitions.
+# Formatted with the projection, so DuckDB's struct literal braces are doubled.
+CANDLES_QUERY = """
+SELECT {columns} FROM read_parquet(
+    ?,
+    hive_partitioning = true,
+    hive_types = {{'year': VARCHAR, 'month': VARCHAR}}
+)
+WHERE year || '-' || month BETWEEN ? AND ?
+AND timestamp BETWEEN ? AND ?
+ORDER BY timestamp ASC
+"""
+
+# Only the data files of the partitioned table, never the per month tables of the legacy SYMBOL/YYYY/MM.parquet layout
+DATA_FILES = "year=*/month=*/*.parquet"
+LEGACY_TABLES = "[0-9][0-9][0-9][0-9]/[0-9][0-9].parquet"  # Relative to a symbol directory, one Delta table per month
+OHLCV_COLUMNS = ["time", "low", "high", "open", "close", "volume"]  # Layout of the batches given to `store`
+
+STORED_RANGE_QUERY = "SELECT min(time), max(time) FROM read_parquet(?)"
+
+# Spacing of consecutive stored candles, the smallest one tells the granularity the table was filled with
+STEPS = "SELECT time, time - lag(time) OVER (ORDER BY time) AS step FROM read_parquet(?)"
+COVERAGE_QUERY = f"SELECT min(time), max(time), min(step), bool_or(time % ? != 0) FROM ({STEPS})"
+GAPS_QUERY = f"SELECT time - step, time FROM ({STEPS}) WHERE step > ? ORDER BY time"
+GAP_CANDLES = 300  # Shorter holes are taken for periods without trades, which Coinbase leaves out of its candles
+STORED_TIMES_QUERY = "SELECT time FROM read_parquet(?) WHERE time BETWEEN ? AND ?"  # Row group statistics skip files outside the range
+
 class CoinDB:
-    def __init__(self, dir: Path):
+    def __init__(self, dir: Path, flush_rows: int = FLUSH_ROWS):
         """
         Initializes CoinDB for storing cryptocurrency data in Delta Lake format.
 
         Args:
             dir (Path): The root directory where data will be stored.
+            flush_rows (int): Number of buffered rows per symbol that triggers a write (defaults to FLUSH_ROWS).
+
+        Candles still stored in the legacy `SYMBOL/YYYY/MM.parquet` layout are migrated
+        into the partitioned table of their symbol first, see `_migrate_legacy_tables`.
         """
         self._dir = Path(dir)
         self._dir.mkdir(parents=True, exist_ok=True)
-        self.buffers = {}  # Store in-memory batches for each coin & month
+        self._flush_rows = flush_rows
+        self._con = duckdb.connect()  # In-memory connection reused by every query
+        self.buffers = {}  # Store in-memory batches for each coin
+        self._buffered_rows = {}  # Total number of rows across the batches of each coin
+        self._written = set()  # Symbols appended to during the current store, compacted at its end
+        self._migrate_legacy_tables()
 
-    async def store(self, gen: AsyncGenerator[Dict[str, List[List[float | int]]], None]):
+    async def store(self, gen: AsyncGenerator[Dict[str, str | np.ndarray], None]):
         """
         Stores streamed cryptocurrency data from an async generator into Delta Lake partitions.
 
+        Rows are buffered per symbol and committed in a single append once `flush_rows`
+        is reached, so one Delta transaction may cover many months. Whatever is left in
+        the buffers is flushed when the generator is exhausted, after which every table
+        that received data is compacted.
+
         Args:
-            gen (AsyncGenerator[Dict[str, List[List[float | int]]], None]): 
-                An async generator yielding OHLCV data.
+            gen (AsyncGenerator[Dict[str, str | np.ndarray], None]): 
+                An async generator yielding OHLCV data as (N, 6) arrays of time, low, high, open, close, volume.
         """
-        active_month = {}  # Track the current active month for each symbol
-
         async for update in gen:
             symbol = update["symbol"]
             data = update["data"]
 
-            if not data:
+            if not len(data):
                 continue  # Skip if no new data
 
-            # Determine timestamp and partition (year, month)
-            last_candle_ts = data[-1][0]  # Last row timestamp in batch
-            timestamp = datetime.fromtimestamp(last_candle_ts, tz=timezone.utc)
-            year, month = timestamp.strftime("%Y"), timestamp.strftime("%m")
+            self.buffers.setdefault(symbol, []).append(data)  # Keep whole batches, copied once on flush
+            self._buffered_rows[symbol] = self._buffered_rows.get(symbol, 0) + len(data)
 
-            key = (symbol, year, month)
-            if key not in self.buffers:
-                self.buffers[key] = []
+            if self._buffered_rows[symbol] >= self._flush_rows:
+                await self._flush(symbol)
 
-            # Check if we have switched to a new month
-            if symbol in active_month and active_month[symbol] != (year, month):
-                prev_year, prev_month = active_month[symbol]
-                await self._flush(symbol, prev_year, prev_month)  # 🔹 Flush previous month
+        for symbol in list(self.buffers):
+            await self._flush(symbol)
 
-            # Update active month for this symbol
-            active_month[symbol] = (year, month)
+        for symbol in self._written:
+            await asyncio.to_thread(self.compact, symbol)
+        self._written.clear()
 
-            self.buffers[key].extend(data)  # Append new data **after flushing previous month**
+    async def _flush(self, symbol: str):
+        """
+        Flushes accumulated data for a given symbol to its Delta table, partitioned by year and month.
 
-    async def _flush(self, symbol: str, year: str, month: str):
+        Args:
+            symbol (str): The cryptocurrency symbol (e.g., BTC-USD).
         """
-        Flushes accumulated data for a given month to Delta Lake.
+        batches = self.buffers.pop(symbol, None)
+        rows = self._buffered_rows.pop(symbol, 0)
+        if not rows:
+            return  # Nothing to flush
+
+        # Encoding and writing release the GIL, so the fetch workers keep downloading on the loop meanwhile
+        await asyncio.to_thread(self._write, symbol, batches)
+        self._written.add(symbol)
+
+    def _write(self, symbol: str, batches: List[np.ndarray]):
+        """
+        Appends buffered batches to the Delta table of a symbol, partitioned by year and month.
 
         Args:
             symbol (str): The cryptocurrency symbol (e.g., BTC-USD).
-            year (str): The year of the data.
-            month (str): The month of the data.
+            batches (List[np.ndarray]): (N, 6) arrays of time, low, high, open, close, volume.
         """
         logger = logger_manger.get_logger(symbol)
-        key = (symbol, year, month)
-        if key not in self.buffers or not self.buffers[key]:
-            return  # Nothing to flush
-        
-        delta_path = str(self._dir / symbol / year / f"{month}.parquet")
-        self._dir.joinpath(symbol, year).mkdir(parents=True, exist_ok=True)
-
-        # Convert to Arrow Table
-        table = pa.Table.from_pydict(
-            {
-                "time": [row[0] for row in self.buffers[key]],
-                "low": [row[1] for row in self.buffers[key]],
-                "high": [row[2] for row in self.buffers[key]],
-                "open": [row[3] for row in self.buffers[key]],
-                "close": [row[4] for row in self.buffers[key]],
-                "volume": [row[5] for row in self.buffers[key]],
-                "timestamp": [datetime.fromtimestamp(row[0], tz=timezone.utc) for row in self.buffers[key]]
-            }
+        delta_path = str(self._dir / symbol)
+
+        data = np.concatenate(batches)
+        time = data[:, 0].astype(np.int64)
+
+        # Coinbase returns every window newest first, sorting by time keeps the written statistics selective.
+        # Batches given to `store` may also overlap each other, unique keeps the first copy of a candle while sorting.
+        if len(time) > 1 and (np.diff(time) <= 0).any():
+            time, order = np.unique(time, return_index=True)
+            data = data[order]
+
+        # Nor may a batch repeat a candle an earlier flush already committed
+        stored = self._stored_times(symbol, int(time[0]), int(time[-1]))
+        if len(stored):
+            fresh = ~np.isin(time, stored)
+            time, data = time[fresh], data[fresh]
+        rows = len(time)
+        if not rows:
+            logger.info("⏭️ All %s candles were already stored", symbol)
+            return
+
+        # Transposed into a C ordered copy, so every column is one contiguous buffer Arrow wraps without copying again
+        columns = np.ascontiguousarray(data.T)
+        timestamp = pa.array(time * 1_000_000, type=pa.timestamp("us", tz="UTC"))
+        table = pa.Table.from_arrays(
+            [
+                pa.array(time),
+                pa.array(columns[1]),
+                pa.array(columns[2]),
+                pa.array(columns[3]),
+                pa.array(columns[4]),
+                pa.array(columns[5]),
+                timestamp,
+                pc.strftime(timestamp, format="%Y"),
+                pc.strftime(timestamp, format="%m")
+            ],
+            names=list(CANDLE_COLUMNS)
+        )
+
+        write_deltalake(
+            delta_path,
+            table,
+            mode="append",
+            partition_by=["year", "month"],
+            writer_properties=WRITER_PROPERTIES
         )
+        logger.info("✅ Stored %d %s candles", rows, symbol)
+
+    def _stored_times(self, symbol: str, start: int, end: int) -> np.ndarray:
+        """
+        Returns the timestamps of the candles already stored for a symbol within a range.
+
+        Args:
+            symbol (str): Cryptocurrency pair (e.g., "BTC-USD").
+            start (int): Unix timestamp (seconds) of the start of the range, inclusive.
+            end (int): Unix timestamp (seconds) of the end of the range, inclusive.
+
+        Returns:
+            np.ndarray: The stored int64 timestamps, empty if there are none.
+        """
+        if not self._has_table(symbol):
+            return np.empty(0, dtype=np.int64)
+
+        # Called from the writer thread, a cursor is a separate connection safe to use next to the loop's queries
+        with self._con.cursor() as con:
+            return con.execute(STORED_TIMES_QUERY, [self._data_files(symbol), start, end]).fetchnumpy()["time"]
+
+    def _has_table(self, symbol: str) -> bool:
+        return (self._dir / symbol / "_delta_log").is_dir()
+
+    def _data_files(self, symbol: str) -> str:
+        return f"{self._dir}/{symbol}/{DATA_FILES}"
+
+    def _migrate_legacy_tables(self):
+        """
+        Moves candles stored in the legacy layout into the partitioned table of their symbol.
 
-   
-        write_deltalake(delta_path, table, mode="append")
-        logger.info(f"✅ Stored {symbol} data for {year}-{month}")
+        Earlier versions wrote one Delta table per month under `SYMBOL/YYYY/MM.parquet`. Each of
+        them is appended to `SYMBOL` (duplicates of already migrated candles are dropped) and
+        removed once written, so an interrupted migration simply resumes on the next start.
+        """
+        for symbol_dir in sorted(path for path in self._dir.iterdir() if path.is_dir()):
+            legacy = sorted(path for path in symbol_dir.glob(LEGACY_TABLES) if (path / "_delta_log").is_dir())
+            if not legacy:
+                continue
+
+            symbol = symbol_dir.name
+            logger = logger_manger.get_logger(symbol)
+            logger.info("📦 Migrating %d legacy monthly %s tables", len(legacy), symbol)
+            for path in legacy:
+                table = DeltaTable(str(path)).to_pyarrow_table(columns=OHLCV_COLUMNS)
+                if table.num_rows:
+                    data = np.column_stack([table.column(name).to_numpy().astype(np.float64) for name in OHLCV_COLUMNS])
+                    self._write(symbol, [data])
+                shutil.rmtree(path)
+
+            for year_dir in {path.parent for path in legacy}:
+                if not any(year_dir.iterdir()):
+                    year_dir.rmdir()
+            self.compact(symbol)
+
+    def compact(self, symbol: str):
+        """
+        Merges the small files left by incremental appends into larger ones, partition by partition.
+
+        Args:
+            symbol (str): Cryptocurrency pair (e.g., "BTC-USD").
+        """
+        if not self._has_table(symbol):
+            return
+
+        logger = logger_manger.get_logger(symbol)
+        table = DeltaTable(str(self._dir / symbol))
+        metrics = table.optimize.compact(writer_properties=WRITER_PROPERTIES)
+        if not metrics["numFilesRemoved"]:
+            return  # No partition had small files to merge, nothing was rewritten and nothing needs removing
+
+        # Reads glob the parquet files directly, so the files replaced by the compaction must not linger
+        table.vacuum(retention_hours=0, enforce_retention_duration=False, dry_run=False)
+        logger.info("🧹 Compacted %d %s files into %d", metrics["numFilesRemoved"], symbol, metrics["numFilesAdded"])
+
+    def stored_range(self, symbol: str) -> Tuple[int, int] | None:
+        """
+        Returns the timestamps of the oldest and the most recent candles stored for a symbol.
+
+        Args:
+            symbol (str): Cryptocurrency pair (e.g., "BTC-USD").
+
+        Returns:
+            Tuple[int, int]: Unix timestamps (seconds) of the oldest and newest stored candles.
+            None: If nothing has been stored for `symbol` yet.
+        """
+        if not self._has_table(symbol):
+            return None
+
+        first, last = self._con.execute(STORED_RANGE_QUERY, [self._data_files(symbol)]).fetchone()
+        return None if first is None else (first, last)
+
+    def coverage(self, symbol: str, granularity: int) -> Tuple[int, int, List[Tuple[int, int]]] | None:
+        """
+        Returns the span of the candles stored for a symbol and the holes within it.
+
+        A hole is a run of at least GAP_CANDLES missing candles, as left behind by a window that could
+        not be fetched. Shorter runs are expected wherever a coin went without trades.
 
-        # Clear the buffer for this month
-        self.buffers[key] = []
+        Args:
+            symbol (str): Cryptocurrency pair (e.g., "BTC-USD").
+            granularity (int): The candle interval in seconds the table is expected to hold.
 
-    def query(self, symbol: str, start_date: str | datetime, end_date: str | datetime):
+        Returns:
+            Tuple[int, int, List[Tuple[int, int]]]: Unix timestamps (seconds) of the oldest and newest stored
+                candles, and the first and last missing candle of every hole in chronological order.
+            None: If nothing has been stored for `symbol` yet.
+
+        Raises:
+            ValueError: If the stored candles are of another granularity, a fetch would mix both in one table.
+        """
+        if not self._has_table(symbol):
+            return None
+
+        files = self._data_files(symbol)
+        # Called off the loop, a cursor is a separate connection safe to use next to the loop's queries
+        with self._con.cursor() as con:
+            first, last, step, off_grid = con.execute(COVERAGE_QUERY, [granularity, files]).fetchone()
+            if first is None:
+                return None
+
+            if off_grid or (step is not None and step != granularity):
+                raise ValueError(f"{symbol} holds candles of another granularity, they can't be completed with {granularity}s candles")
+
+            gaps = con.execute(GAPS_QUERY, [files, GAP_CANDLES * granularity]).fetchall()
+
+        return first, last, [(start + granularity, end - granularity) for start, end in gaps]
+
+    def query(
+        self,
+        symbol: str,
+        start_date: str | datetime,
+        end_date: str | datetime,
+        columns: Sequence[str] | None = None
+    ):
         """
         Queries historical data efficiently using DuckDB.
 
@@ -100,21 +323,37 @@ class CoinDB:
             symbol (str): Cryptocurrency pair (e.g., "BTC-USD").
             start_date (datetime): Start of the query range.
             end_date (datetime): End of the query range.
+            columns (Sequence[str] | None): Columns to return, all of CANDLE_COLUMNS by default.
+                Only the requested columns are decoded from the Parquet files.
 
         Returns:
             pd.DataFrame: Query results as a Pandas DataFrame.
-        """
 
+        Raises:
+            ValueError: If `columns` is empty or names a column that is not in CANDLE_COLUMNS.
+        """
+        if columns is None:
+            projection = "*"
+        else:
+            if not columns:
+                raise ValueError("At least one column must be requested")
+            unknown = [column for column in columns if column not in CANDLE_COLUMNS]
+            if unknown:
+                raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+            projection = ", ".join(columns)  # Safe to inline, every name was checked against CANDLE_COLUMNS
 
         if type(start_date) is str:
             start_date = datetime.fromisoformat(start_date).replace(tzinfo=timezone.utc)
         if type(end_date) is str:
             end_date = datetime.fromisoformat(end_date).replace(tzinfo=timezone.utc) 
 
-        query = f"""
-        SELECT * FROM read_parquet('{self._dir}/{symbol}/**/*.parquet')
-        WHERE timestamp BETWEEN '{start_date.isoformat()}' AND '{end_date.isoformat()}'
-        ORDER BY timestamp ASC
-        """
-
-        return duckdb.query(query).to_df()
\ No newline at end of file
+        return self._con.execute(
+            CANDLES_QUERY.format(columns=projection),
+            [
+                self._data_files(symbol),
+                f"{start_date:%Y-%m}",
+                f"{end_date:%Y-%m}",
+                start_date,
+                end_date
+            ]
+        ).df()
\ No newline at end of file
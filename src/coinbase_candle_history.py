@@ -9,21 +9,23 @@ Features:
     - Fetches historical OHLCV (Open, High, Low, Close, Volume) candlestick data in batches.
     - Supports fetching multiple cryptocurrency pairs simultaneously.
     - Allows continuous fetching when no end date is provided, ensuring up-to-date market data.
+    - Fetches several coins concurrently under a single shared rate limiter.
     - Implements rate limiting and exponential backoff for API stability.
     - Uses async generators to efficiently stream large datasets without excessive memory usage.
 
 Classes:
-    - CoinbaseCandleHistory: Provides two static methods:
+    - CoinbaseCandleHistory: Provides the following static methods:
+        - `create_session`: Creates an aiohttp session tuned for Coinbase requests.
+        - `get_session` / `close_session`: Manage the session shared by every `fetch` call.
+        - `fetch_product`: Fetches the listing of a single product.
         - `fetch_timeframe`: Fetches a specific range of historical data in chunks.
         - `fetch`: Manages multi-coin fetching, supporting both fixed and continuous retrieval.
 
 Usage Example:
-    import aiohttp
     from coinbase_candle_history import CoinbaseCandleHistory
 
-    async with aiohttp.ClientSession() as session:
-        async for data_chunk in CoinbaseCandleHistory.fetch(session, ["BTC-USDT", "ETH-USDT"], "2021-01-01"):
-            process(data_chunk)  # Handle the received chunk (e.g., store in a database)
+    async for data_chunk in CoinbaseCandleHistory.fetch(["BTC-USDT", "ETH-USDT"], "2021-01-01"):
+        process(data_chunk)  # Handle the received chunk (e.g., store in a database)
 
 Notes:
     - The generator-based design ensures efficient handling of large datasets without consuming too much memory.
@@ -32,65 +34,120 @@ Notes:
 """
 
 
-from datetime import datetime, timezone, timedelta
-from typing import Optional, List, AsyncGenerator, Dict, Iterable, Literal
+from datetime import datetime, timezone
+from functools import lru_cache
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Optional, List, AsyncGenerator, Callable, Dict, Iterable, Tuple
+from enum import IntEnum
 import asyncio
+import calendar
+import os
+import tempfile
+import random
+import time
 import aiohttp
-from aiohttp import ContentTypeError
-from json import JSONDecodeError
+import orjson
+from yarl import URL
+import numpy as np
 
 
 from utils.loggers.logger import logger_manger
-from utils.algorithms import binary_search_first_occurrence_async
+from utils.algorithms import exponential_search_first_occurrence_async
+from utils.limiters import AsyncTokenBucket
 from utils.configs import CONFIG
 
+COINBASE_PRODUCT_URL = "https://api.exchange.coinbase.com/products/{}"
 COINBASE_CANDLES_URL = "https://api.exchange.coinbase.com/products/{}/candles"
-COINBASE_RATE_LIMIT = 1/7  # Increase up to 10 at your own risk
+COINBASE_RATE_LIMIT = 9  # Requests per second, Coinbase allows up to 10 for public endpoints
+COINBASE_BURST = 10 # Requests that may be sent at once after being idle
+RETRY_AFTER_DEFAULT = 1 # Seconds to hold back after a 429 without a Retry-After header
 MAX_CANDLES = 300 # Max Candles allowed per request 
-FUTURE_OFFSET = 10000 # Offset for downloading data continuously 
 TIMEOUT = 10 # Request timeout in seconds
+CONNECT_TIMEOUT = 2 # Seconds allowed for the TCP and TLS handshake, so a dead host doesn't consume the whole TIMEOUT
+READ_TIMEOUT = 8 # Seconds allowed between two reads of a response
+MAX_RETRIES = 5 # Attempts per chunk before a transient failure is given up on
+MAX_BACKOFF = 60 # Upper bound in seconds of the exponential backoff between attempts, and of any wait a server asks for
+RESET_EPOCH_AFTER = 1_000_000_000 # A rate limit reset above this is an epoch timestamp (2001 onwards), not a delay in seconds
+MAX_CONCURRENT_SYMBOLS = 8 # Coins fetched in parallel, all sharing the same rate limit
+SEEK_PROBES = 4 # Concurrent probes per round while narrowing down the first candle of a coin
+PREFETCH_WINDOWS = 4 # Candle windows of a single coin requested ahead of the one being yielded
+MAX_IN_FLIGHT = 10 # Requests open against Coinbase at once across all coins, enforced by the connector
+DNS_CACHE_TTL = 300 # Seconds a resolved Coinbase address is reused
+KEEPALIVE_TIMEOUT = 75 # Seconds an idle connection is kept open for the next request
+# `connect` would also count the wait for a free pooled connection, which queued prefetches routinely exceed,
+# so only the handshake is bounded on its own and the pool wait falls under `total`
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=TIMEOUT, sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT)
+RATE_LIMITER = AsyncTokenBucket(COINBASE_RATE_LIMIT, COINBASE_BURST) # Coinbase limits requests per IP, so every request in the process shares it
+
+class FetchStatus(IntEnum):
+     """
+     Outcome of a single Coinbase request, returned alongside its payload.
+     """
+     OK = 0
+     NOT_FOUND = 1  # The coin pair does not exist (404)
+     API_FAILURE = 2  # Any other non 200 status or an invalid payload
+     NO_DATA = 3  # The request succeeded but the window holds no candles
+     TIMEOUT = 4  # The request took longer than TIMEOUT seconds
+     RATE_LIMITED = 5  # Coinbase rejected the request due to rate limits (429)
+     SERVER_ERROR = 6  # Coinbase returned a 5xx error
+
+_session: Optional[aiohttp.ClientSession] = None  # Shared across fetch calls, see CoinbaseCandleHistory.get_session
+_session_loop: Optional[asyncio.AbstractEventLoop] = None  # Loop the shared session was created on
+
+def _iso_from_epoch(timestamp: int) -> str:
+     return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp))  # UTC ISO 8601, "Z" keeps it URL safe unlike "+00:00"
+
+def _server_delay(value: float) -> float:
+     if value > RESET_EPOCH_AFTER:
+          value -= time.time()  # Sent as the moment the window resets rather than the seconds until then
+     return min(max(value, 0.0), MAX_BACKOFF)  # A bogus header must not stall every request indefinitely
+
+def _first_timestamp_path(symbol: str) -> Path:
+     return Path(CONFIG.CACHE_DIR) / f"{symbol}.firstts"
+
+def _load_first_timestamp(symbol: str) -> Optional[int]:
+     try:
+          return int(_first_timestamp_path(symbol).read_text())
+     except (FileNotFoundError, ValueError):
+          return None  # Never searched, or the cache file is corrupted
+
+def _save_first_timestamp(symbol: str, timestamp: int):
+     path = _first_timestamp_path(symbol)
+     path.parent.mkdir(parents=True, exist_ok=True)
+     fd, tmp = tempfile.mkstemp(dir=path.parent)
+     try:
+          with os.fdopen(fd, "w") as file:
+               file.write(str(timestamp))
+          os.replace(tmp, path)  # Atomic, a concurrent reader sees either the old or the new value
+     except BaseException:
+          os.unlink(tmp)  # Never replaced the cache, so the partial temp file must not be left behind
+          raise
+
+@lru_cache(maxsize=None)
+def _candles_url(symbol: str) -> str:
+     return COINBASE_CANDLES_URL.format(symbol)  # Formatted once per symbol instead of once per request
 
 class CoinbaseCandleHistory:
      @staticmethod
-     async def fetch_timeframe(
-          session: aiohttp.ClientSession,
-          symbol: str,
-          start_time: datetime,
-          end_time: datetime | None = None,
-          granularity: int = 60) -> Dict[str, str | List[List[float | int]]] | Literal["not_found", "api_failure", "no_data", "timeout_error"]:
+     def create_session() -> aiohttp.ClientSession:
           """
-          Fetches a specific time range of cryptocurrency candle data from Coinbase API.
+          Creates an aiohttp session tuned for repeated Coinbase candle requests.
 
-          Args:
-               session (aiohttp.ClientSession): The aiohttp session.
-               symbol (str): The cryptocurrency pair (e.g., "BTC-USDT").
-               start_time (datetime): The starting point for fetching data.
-               end_time (datetime or None): The ending point for fetching data. Assigned start_time + MAX_CANDLES (minutes) if None provided.
-               granularity (int): The candle interval in seconds (defaults to 60s).
- 
-          Returns:
-               dict: {'symbol': symbol, 'data': List[List]} containing fetched OHLCV data.
-               str: `"not_found"` if the coin pair wasn't found in database (404 error).
-                    `"api_failure"` if the response status was not 200 or returned invalid JSON.
-                    `"no_data"` if the response was successful but no candle data present in it.
-                    `"timeout_error"` if the request took longer than TIMEOUT seconds.
-                    `"rate_limited"` if the request was blocked due to API rate limits (429).
-                    `"server_error"` if Coinbase returns a 5xx server error.
+          The connector keeps connections and DNS lookups alive between requests, and the
+          identification headers and request timeout are set once as session defaults
+          instead of being rebuilt for every request. Must be called from a running event loop.
 
+          Returns:
+               aiohttp.ClientSession: The configured session, to be closed by the caller.
           """
-          url = COINBASE_CANDLES_URL.format(symbol)
-          chunk_size = timedelta(minutes=MAX_CANDLES)
-
-          if end_time is None or end_time <= start_time:
-               end_time = start_time + chunk_size
-          else:
-               end_time = min(start_time + chunk_size, end_time)
-
-          params = {
-               "start": start_time.isoformat(),
-               "end": end_time.isoformat(),
-               "granularity": granularity
-          }
+          connector = aiohttp.TCPConnector(
+               limit=MAX_IN_FLIGHT,
+               limit_per_host=MAX_IN_FLIGHT,
+               ttl_dns_cache=DNS_CACHE_TTL,
+               keepalive_timeout=KEEPALIVE_TIMEOUT
+          )
           headers = {
                "User-Agent": CONFIG.USER_AGENT,
                "Accept": "application/json",
@@ -98,146 +155,505 @@ class CoinbaseCandleHistory:
                "X-App-Version": CONFIG.VERSION,  
                "X-Repo-Link": CONFIG.REPO_LINK  
           }
+          return aiohttp.ClientSession(
+               connector=connector,
+               headers=headers,
+               timeout=REQUEST_TIMEOUT,
+               json_serialize=lambda obj: orjson.dumps(obj).decode()  # aiohttp expects str, orjson gives bytes
+          )
 
-          logger = logger_manger.get_logger(symbol)
+     @staticmethod
+     async def get_session() -> aiohttp.ClientSession:
+          """
+          Returns the process wide Coinbase session, creating it with `create_session` on first use.
+
+          The session keeps its connection pool and DNS cache across `fetch` calls. It is recreated
+          if it was closed or belongs to an event loop that is no longer running. Applications
+          should call `close_session` on shutdown (e.g. at the end of a FastAPI lifespan).
+
+          Returns:
+               aiohttp.ClientSession: The shared session.
+          """
+          global _session, _session_loop
+          loop = asyncio.get_running_loop()
+          if _session is None or _session.closed or _session_loop is not loop:
+               _session = CoinbaseCandleHistory.create_session()
+               _session_loop = loop
+          return _session
 
+     @staticmethod
+     async def close_session():
+          """
+          Closes the shared session of `get_session`, if one is open.
+          """
+          global _session, _session_loop
+          if _session is not None and not _session.closed:
+               await _session.close()
+          _session = None
+          _session_loop = None
+
+     @staticmethod
+     def _apply_rate_limit_headers(response: aiohttp.ClientResponse):
+          """
+          Feeds the rate limit hints of a Coinbase response into RATE_LIMITER.
+
+          Args:
+               response (aiohttp.ClientResponse): The response to read `CB-RATELIMIT-REMAINING` / `RateLimit-Remaining`,
+                    `RateLimit-Reset` and `Retry-After` from.
+          """
+          headers = response.headers
           try:
-               response = await asyncio.wait_for(session.get(url, params=params, headers=headers), timeout=TIMEOUT)
-               if response.status == 404:
-                    logger.critical(f"❌ {symbol} not found in database")
-                    return "not_found"
+               remaining = headers.get("CB-RATELIMIT-REMAINING") or headers.get("RateLimit-Remaining")
+               if remaining is not None:
+                    remaining = float(remaining)
+                    RATE_LIMITER.sync(remaining)
+
+                    reset = headers.get("CB-RATELIMIT-RESET") or headers.get("RateLimit-Reset")
+                    if remaining < 1 and reset is not None:
+                         RATE_LIMITER.defer(_server_delay(float(reset)))  # Budget is spent, wait for the window to reset
 
                if response.status == 429:
-                    logger.warning(f"🔄 Rate limit hit for {symbol}. Coinbase suggests retrying later.")
-                    return "rate_limited"
+                    RATE_LIMITER.defer(_server_delay(float(headers.get("Retry-After", RETRY_AFTER_DEFAULT))))
+          except ValueError:
+               pass  # Retry-After may also be an HTTP date, pacing then falls back to the bucket itself
+
+     @staticmethod
+     async def fetch_product(
+          session: aiohttp.ClientSession,
+          symbol: str) -> Tuple[FetchStatus, Optional[Dict[str, str | bool]]]:
+          """
+          Fetches the listing of a single product from Coinbase API.
+
+          A single request tells whether a pair exists at all, which is much cheaper than
+          discovering it through the candle probes of the first occurence search.
+
+          Args:
+               session (aiohttp.ClientSession): The aiohttp session, preferably made by `create_session`.
+               symbol (str): The cryptocurrency pair (e.g., "BTC-USDT").
+
+          Returns:
+               Tuple[FetchStatus, dict or None]: `FetchStatus.OK` and the product listing (id, status, trading_disabled, ...).
+                    `FetchStatus.NOT_FOUND` and None if the coin pair is not listed on Coinbase (404 error).
+                    `FetchStatus.API_FAILURE` and None if the request failed for any other reason.
+          """
+          logger = logger_manger.get_logger(symbol)
+
+          try:
+               await RATE_LIMITER.acquire()
+               async with session.get(COINBASE_PRODUCT_URL.format(symbol)) as response:
+                    CoinbaseCandleHistory._apply_rate_limit_headers(response)
+                    if response.status == 404:
+                         logger.critical("❌ %s is not listed on coinbase", symbol)
+                         return FetchStatus.NOT_FOUND, None
+
+                    if response.status != 200:
+                         logger.error("⚠️ fetching %s listing: (%d) %s", symbol, response.status, await response.text())
+                         return FetchStatus.API_FAILURE, None
+
+                    return FetchStatus.OK, orjson.loads(await response.read())
+
+          except (asyncio.TimeoutError, aiohttp.ClientError, orjson.JSONDecodeError) as e:
+               logger.error("🚨 Failed fetching %s listing: %s", symbol, e)
+               return FetchStatus.API_FAILURE, None
+
+     @staticmethod
+     async def fetch_timeframe(
+          session: aiohttp.ClientSession,
+          symbol: str,
+          start_time: datetime | int,
+          end_time: datetime | int | None = None,
+          granularity: int = 60) -> Tuple[FetchStatus, Optional[Dict[str, str | np.ndarray]]]:
+          """
+          Fetches a specific time range of cryptocurrency candle data from Coinbase API.
+
+          Args:
+               session (aiohttp.ClientSession): The aiohttp session, preferably made by `create_session`.
+               symbol (str): The cryptocurrency pair (e.g., "BTC-USDT").
+               start_time (datetime or int): The starting point for fetching data, as a datetime or Unix seconds.
+               end_time (datetime, int or None): The ending point for fetching data. Assigned start_time + MAX_CANDLES candles if None provided.
+               granularity (int): The candle interval in seconds (defaults to 60s).
+ 
+          Returns:
+               Tuple[FetchStatus, dict or None]: `FetchStatus.OK` and {'symbol': symbol, 'data': np.ndarray}
+                    containing fetched OHLCV data as an (N, 6) float64 array with columns time, low, high, open, close, volume.
+                    Any other status (see `FetchStatus`) and None otherwise. Timeouts, network errors, 429 and 5xx
+                    responses are retried up to MAX_RETRIES times with exponential backoff before being returned.
+
+          """
+          chunk_size = MAX_CANDLES * granularity  # Widest window Coinbase serves in one request
 
-               if response.status >= 500:
-                    logger.error(f"⚠️ Server error {response.status} for {symbol}.")
-                    return "server_error"
+          start_ts = start_time if isinstance(start_time, int) else int(start_time.timestamp())
+          end_ts = end_time if end_time is None or isinstance(end_time, int) else int(end_time.timestamp())
+          if end_ts is None or end_ts <= start_ts:
+               end_ts = start_ts + chunk_size
+          else:
+               end_ts = min(start_ts + chunk_size, end_ts)
 
-               if response.status != 200:
-                    logger.error(f"⚠️ fetching {symbol}: ({response.status}) {await response.text()}")
-                    return "api_failure" 
+          start_time, end_time = _iso_from_epoch(start_ts), _iso_from_epoch(end_ts)
+          # Every part is already URL safe, so the query is built as is instead of being encoded from a params dict
+          url = URL(f"{_candles_url(symbol)}?start={start_time}&end={end_time}&granularity={granularity}", encoded=True)
+          logger = logger_manger.get_logger(symbol)
 
+          for attempt in range(MAX_RETRIES):
                try:
-                    data = await response.json()
-               except (JSONDecodeError, ContentTypeError):
-                    logger.error(f"⚠️ Malformed JSON response for {symbol}: ({response.status})")
-                    return "api_failure"
-
-               if not isinstance(data, list):
-                    logger.error(f"⚠️ Unexpected response format for {symbol}: {data}")
-                    return "api_failure"
-
-               if data:
-                    logger.debug(f"📊 Downloaded {len(data)} candles for {symbol}: {start_time} → {end_time}")
-                    return {"symbol": symbol, "data": data}
-
-              
-               logger.warning(f"⚠️ No data for {symbol}: {start_time} → {end_time}")
-               return "no_data" 
-
-          except asyncio.TimeoutError:
-               logger.error(f"⏳ Timeout fetching data for {symbol}: {start_time} → {end_time}. Retrying later.")
-               return "timeout_error"  # Avoid getting stuck due to connection problems
-          
-          except aiohttp.ClientError as e:
-            logger.error(f"🚨 Network error fetching {symbol}: {e}")
-            return "api_failure"
+                    await RATE_LIMITER.acquire()
+                    async with session.get(url) as response:  # Releases the connection even if reading fails
+                         CoinbaseCandleHistory._apply_rate_limit_headers(response)
+                         if response.status == 404:
+                              logger.critical("❌ %s not found in database", symbol)
+                              return FetchStatus.NOT_FOUND, None
+
+                         if response.status == 429:
+                              logger.warning("🔄 Rate limit hit for %s. Holding requests back as Coinbase suggests.", symbol)
+                              error = FetchStatus.RATE_LIMITED
+
+                         elif response.status >= 500:
+                              logger.error("⚠️ Server error %d for %s.", response.status, symbol)
+                              error = FetchStatus.SERVER_ERROR
+
+                         elif response.status != 200:
+                              logger.error("⚠️ fetching %s: (%d) %s", symbol, response.status, await response.text())
+                              return FetchStatus.API_FAILURE, None 
+
+                         else:
+                              try:
+                                   data = orjson.loads(await response.read())
+                              except orjson.JSONDecodeError:
+                                   logger.error("⚠️ Malformed JSON response for %s: (%d)", symbol, response.status)
+                                   return FetchStatus.API_FAILURE, None
+
+                              if not isinstance(data, list):
+                                   logger.error("⚠️ Unexpected response format for %s: %s", symbol, data)
+                                   return FetchStatus.API_FAILURE, None
+
+                              if data:
+                                   logger.debug("📊 Downloaded %d candles for %s: %s → %s", len(data), symbol, start_time, end_time)
+                                   return FetchStatus.OK, {"symbol": symbol, "data": np.asarray(data, dtype=np.float64)}
+
+                              logger.warning("⚠️ No data for %s: %s → %s", symbol, start_time, end_time)
+                              return FetchStatus.NO_DATA, None 
+
+               except asyncio.TimeoutError:
+                    logger.error("⏳ Timeout fetching data for %s: %s → %s.", symbol, start_time, end_time)
+                    error = FetchStatus.TIMEOUT  # Avoid getting stuck due to connection problems
+               
+               except aiohttp.ClientError as e:
+                    logger.error("🚨 Network error fetching %s: %s", symbol, e)
+                    error = FetchStatus.API_FAILURE
+
+               if attempt + 1 < MAX_RETRIES:
+                    delay = min(2 ** attempt, MAX_BACKOFF) + random.random()  # Jitter keeps coins from retrying in lockstep
+                    logger.info("🔁 Retrying %s in %.1fs (attempt %d/%d)", symbol, delay, attempt + 2, MAX_RETRIES)
+                    await asyncio.sleep(delay)
+
+          logger.error("🚨 Giving up on %s: %s → %s after %d attempts (%s)", symbol, start_time, end_time, MAX_RETRIES, error.name)
+          return error, None
           
      @staticmethod
      async def fetch(
      symbols: Iterable[str],
      start_date: Optional[str] = None,
      end_date: Optional[str] = None,
-     granularity: int = 60
-     ) -> AsyncGenerator[Dict[str, str | List[List[float | int]]], None]:
-          """
-          Sequentially fetches historical and live cryptocurrency data for multiple coins.
-
-          Instead of switching between coins in every iteration, it completes fetching **one** 
-          coin up until today, then switches to the next.
-          """
-          async with aiohttp.ClientSession() as session:
-               now = datetime.now(timezone.utc)
-
-               if start_date is None:
-                    start_date = "2012-01-01"
-
-               start_date: datetime = datetime.fromisoformat(start_date).replace(tzinfo=timezone.utc)
-
-               if end_date is None or end_date > now:  # If no end date is provided, or it is set too far away set it to today
-                    end_date = now  
-               else:
-                    end_date: datetime = datetime.fromisoformat(end_date).replace(tzinfo=timezone.utc)
-
-               for symbol in symbols:   
-                    logger = logger_manger.get_logger(symbol)
-                   
-                    logger.info(f"🫣 Seeking first occurence of coinbase data for {symbol} from {start_date} to {end_date}")
-                    async def condition(timestamp: int) -> bool:
-                         datetime_obj = datetime.fromtimestamp(timestamp, tz=timezone.utc)
-                         response = await CoinbaseCandleHistory.fetch_timeframe(session, symbol, datetime_obj)
-                         if not isinstance(response, dict) or "data" not in response:
-                              return False
-                         return bool(response["data"])
-
-                    first_available_timestamp = await binary_search_first_occurrence_async(
-                         condition, 
-                         int(start_date.timestamp()),
-                         int(end_date.timestamp()),
-                         max_depth=32  # Control recursion depth
-                    )
-                    logger.info(f"🎉 Found first occurence of coibnase data")
-                    logger.info(f"📡 Fetching historical data for {symbol} from {start_date} to {end_date} with {granularity}s granularity.")
-
-                    if first_available_timestamp == -1:
-                         logger.warning(f"⚠️ No historical data found for {symbol} within the given range.")
+     granularity: int = 60,
+     stored: Optional[Callable[[str, int], Optional[Tuple[int, int, List[Tuple[int, int]]]]]] = None,
+     session: Optional[aiohttp.ClientSession] = None,
+     coalesce: int = 1,
+     reseek: bool = False
+     ) -> AsyncGenerator[Dict[str, str | np.ndarray], None]:
+          """
+          Concurrently fetches historical and live cryptocurrency data for multiple coins.
+
+          Up to MAX_CONCURRENT_SYMBOLS coins are fetched at the same time, each by its own worker
+          task. All requests go through RATE_LIMITER, since Coinbase limits requests per IP rather
+          than per product. Results are funneled through a bounded queue, so chunks of a single
+          coin are still yielded in chronological order while chunks of different coins interleave.
+
+          When `stored` is given, it is called off the loop with each symbol and the granularity, and should
+          return the timestamps of the oldest and newest candles already ingested along with the holes
+          in between (e.g. `CoinDB.coverage`), or None. Only the holes and the gaps around that interval
+          are then fetched, so re-runs don't download immutable history again.
+
+          Requests go through `session` when given, otherwise through the shared session of `get_session`,
+          so repeated calls reuse the same warm connections.
+
+          With `coalesce` > 1, up to that many consecutive chunks of a coin are joined into a single
+          yielded batch, so consumers doing one write per batch (e.g. a database insert) do fewer of them.
+
+          The first candle found for each coin is cached under CONFIG.CACHE_DIR and reused by later runs,
+          pass `reseek=True` to search for it again.
+          """
+          if coalesce < 1:
+               raise ValueError(f"Invalid coalesce: {coalesce}, must be at least 1.")
+
+          session = session or await CoinbaseCandleHistory.get_session()
+          now = datetime.now(timezone.utc)
+
+          if start_date is None:
+               start_date = "2012-01-01"
+
+          start_date: datetime = datetime.fromisoformat(start_date).replace(tzinfo=timezone.utc)
+
+          if end_date is None:  # If no end date is provided set it to today
+               end_date = now
+          else:
+               end_date: datetime = min(datetime.fromisoformat(end_date).replace(tzinfo=timezone.utc), now)
+
+          semaphore = asyncio.Semaphore(MAX_CONCURRENT_SYMBOLS)
+          queue = asyncio.Queue(maxsize=MAX_CONCURRENT_SYMBOLS)
+
+          async def worker(symbol: str):
+               try:
+                    async with semaphore:
+                         coverage = await asyncio.to_thread(stored, symbol, granularity) if stored is not None else None
+                         chunks = []
+                         async for result in CoinbaseCandleHistory._fetch_symbol(
+                              session, symbol, start_date, end_date, granularity, coverage, reseek
+                         ):
+                              chunks.append(result["data"])
+                              if len(chunks) >= coalesce:
+                                   await queue.put({"symbol": symbol, "data": chunks[0] if coalesce == 1 else np.concatenate(chunks)})
+                                   chunks = []
+
+                         if chunks:  # Whatever is left once the coin is done
+                              await queue.put({"symbol": symbol, "data": np.concatenate(chunks)})
+               except asyncio.CancelledError:
+                    raise  # fetch stopped consuming, nobody is left to receive the done signal on a possibly full queue
+               except Exception:
+                    await queue.put(None)  # Still counted as done, the exception surfaces through gather
+                    raise
+               await queue.put(None)  # Signals that this worker is done
+
+          tasks = [asyncio.create_task(worker(symbol)) for symbol in symbols]
+          try:
+               pending = len(tasks)
+               while pending:
+                    result = await queue.get()
+                    if result is None:
+                         pending -= 1
                          continue
+                    yield result
 
-                    last_fetched = datetime.fromtimestamp(first_available_timestamp, tz=timezone.utc)
-                    finished = False
+               await asyncio.gather(*tasks)  # Surface any exception raised by a worker
+          finally:
+               for task in tasks:
+                    task.cancel()
 
-                    while last_fetched <= end_date and not finished:
-                         result = await CoinbaseCandleHistory.fetch_timeframe(
-                              session,
-                              symbol,
-                              last_fetched,
-                              end_date,
-                              granularity
-                         )
+     @staticmethod
+     async def _fetch_symbol(
+          session: aiohttp.ClientSession,
+          symbol: str,
+          start_date: datetime,
+          end_date: datetime,
+          granularity: int,
+          stored: Optional[Tuple[int, int, List[Tuple[int, int]]]] = None,
+          reseek: bool = False
+     ) -> AsyncGenerator[Dict[str, str | np.ndarray], None]:
+          """
+          Fetches historical data for a single coin, from its first available candle up until the current month.
 
-                         if not isinstance(result, dict):  
-                              logger.error(f"🚨 Unexpected response type for {symbol}: {result}")
-                              last_fetched += timedelta(seconds=granularity)
-                              continue  
+          Candles already ingested are never requested again; only the head before the oldest stored candle,
+          the holes between stored candles and the tail after the newest one are fetched.
 
-                         if result in ["api_failure", "timeout_error"]:
-                              last_fetched += timedelta(seconds=MAX_CANDLES)  
-                              logger.warning(f"⚠️ Fetching issue for {symbol}, skipping to {last_fetched}")
-                              await asyncio.sleep(COINBASE_RATE_LIMIT)  
-                              continue  
+          Args:
+               session (aiohttp.ClientSession): The aiohttp session.
+               symbol (str): The cryptocurrency pair (e.g., "BTC-USDT").
+               start_date (datetime): The earliest point to search data from.
+               end_date (datetime): The latest point to fetch data up to.
+               granularity (int): The candle interval in seconds.
+               stored (Tuple[int, int, List[Tuple[int, int]]] or None): Timestamps of the oldest and newest
+                    candles already ingested, and the first and last missing candle of every hole in between.
+               reseek (bool): Ignores the cached first candle and searches for it again.
+          """
+          logger = logger_manger.get_logger(symbol)
+          start_ts = int(start_date.timestamp())
+          end_ts = int(end_date.timestamp())
+
+          if stored is None:
+               first_available = await CoinbaseCandleHistory._seek_first(session, symbol, start_ts, end_ts, reseek)
+               if first_available is None:
+                    return
+               last_fetched = first_available
+          else:
+               first, last, holes = stored
+               gaps = list(holes)
+               if start_ts < first:  # The head before the stored data is missing
+                    first_available = await CoinbaseCandleHistory._seek_first(session, symbol, start_ts, first, reseek)
+                    if first_available is not None and first_available < first:
+                         gaps.insert(0, (first_available, first - granularity))
+
+               for gap_start, gap_end in gaps:
+                    gap_start, gap_end = max(gap_start, start_ts), min(gap_end, end_ts)
+                    if gap_start > gap_end:
+                         continue  # Outside of the requested range
+                    logger.info("🧩 Filling %s gap from %s to %s", symbol, gap_start, gap_end)
+                    async for result in CoinbaseCandleHistory._fetch_range(session, symbol, gap_start, gap_end, granularity):
+                         yield result
+
+               last_fetched = max(last + granularity, start_ts)  # The tail is fetched even when the head could not be found
+               logger.info("⏩ Resuming %s from %s, earlier data is already stored.", symbol, last_fetched)
+
+          async for result in CoinbaseCandleHistory._fetch_range(session, symbol, last_fetched, end_ts, granularity):
+               yield result
+
+     @staticmethod
+     async def _seek_first(
+          session: aiohttp.ClientSession,
+          symbol: str,
+          start_ts: int,
+          end_ts: int,
+          reseek: bool = False
+     ) -> Optional[int]:
+          """
+          Finds the first candle Coinbase has for a coin within a time range.
+
+          A found listing start of a coin never changes, so it is persisted and later calls answer
+          from it without a single request.
+
+          Args:
+               session (aiohttp.ClientSession): The aiohttp session.
+               symbol (str): The cryptocurrency pair (e.g., "BTC-USDT").
+               start_ts (int): The start of the searched range, in Unix seconds.
+               end_ts (int): The end of the searched range, in Unix seconds.
+               reseek (bool): Ignores the cached first candle and searches for it again.
+
+          Returns:
+               int: The timestamp of the first available candle.
+               None: If the pair does not exist, has no data within the range, or a probe failed after its
+                    retries. Nothing is cached then, so the search runs again next time.
+          """
+          logger = logger_manger.get_logger(symbol)
 
-                         fetched_timestamps = [candle[0] for candle in result["data"]]
-                         if not fetched_timestamps:
-                              last_fetched += timedelta(seconds=granularity)
-                              logger.warning(f"⚠️ No new data for {symbol}, skipping to next batch.")
-                              continue
+          cached = None if reseek else await asyncio.to_thread(_load_first_timestamp, symbol)
+          if cached is not None:
+               first_available_timestamp = max(cached, start_ts)
+               if first_available_timestamp > end_ts:
+                    logger.warning("⚠️ No historical data found for %s within the given range.", symbol)
+                    return None
+
+               logger.info("🗃️ Using cached first occurence of coinbase data for %s: %s", symbol, cached)
+               return first_available_timestamp
+
+          status, _ = await CoinbaseCandleHistory.fetch_product(session, symbol)
+          if status is FetchStatus.NOT_FOUND:
+               return None  # No point probing candles of a pair that does not exist
+
+          logger.info("🫣 Seeking first occurence of coinbase data for %s from %s to %s", symbol, start_ts, end_ts)
+          failed = []  # Statuses of probes that could not tell whether a window holds data
+
+          async def condition(timestamp: int) -> bool:
+               if failed:
+                    return True  # The search is abandoned anyway, let it converge without further requests
+
+               status, _ = await CoinbaseCandleHistory.fetch_timeframe(session, symbol, timestamp)
+               if status is FetchStatus.OK or status is FetchStatus.NO_DATA:
+                    return status is FetchStatus.OK
+
+               failed.append(status)  # Taken for "no data" the search could settle too late and lose the history before it
+               return True
+
+          # Probes cover MAX_CANDLES one minute candles, so the search never needs to be finer than that
+          first_available_timestamp = await exponential_search_first_occurrence_async(
+               condition, 
+               start_ts,
+               end_ts,
+               step=MAX_CANDLES * 60,
+               k_probes=SEEK_PROBES
+          )
+
+          if failed:
+               logger.error("🚨 Seeking the first candle of %s failed (%s), it is searched again on the next run", symbol, failed[0].name)
+               return None
+
+          if first_available_timestamp == -1:
+               logger.warning("⚠️ No historical data found for %s within the given range.", symbol)
+               return None
+
+          logger.info("🎉 Found first occurence of coibnase data")
+          if first_available_timestamp > start_ts:
+               # Data at `start_ts` may only mean the coin is older. Written off the loop, the other coins keep fetching
+               await asyncio.to_thread(_save_first_timestamp, symbol, first_available_timestamp)
+          return first_available_timestamp
 
-                         new_last_fetched = datetime.fromtimestamp(max(fetched_timestamps), tz=timezone.utc)
+     @staticmethod
+     async def _fetch_range(
+          session: aiohttp.ClientSession,
+          symbol: str,
+          last_fetched: int,
+          end_ts: int,
+          granularity: int
+     ) -> AsyncGenerator[Dict[str, str | np.ndarray], None]:
+          """
+          Fetches consecutive candle chunks of a coin, stopping at `end_ts` or once the current month is reached.
 
-                         if new_last_fetched == last_fetched:  
-                              new_last_fetched += timedelta(seconds=granularity)
-                              logger.warning(f"⚠️ Stuck on {symbol} at {last_fetched}, forcing move to {new_last_fetched}")
+          The range is split upfront into windows of MAX_CANDLES candles. Since the windows are independent,
+          up to PREFETCH_WINDOWS of them are requested ahead while earlier ones are still being yielded,
+          and the results are yielded in chronological order. Windows that still fail after their retries
+          are requested once more after the last one, so their results come out of order; windows failing
+          again are logged as errors and left for `CoinDB.coverage` to report as holes on the next run.
 
-                         last_fetched = new_last_fetched  
+          Args:
+               session (aiohttp.ClientSession): The aiohttp session.
+               symbol (str): The cryptocurrency pair (e.g., "BTC-USDT").
+               last_fetched (int): The point to start fetching from, in Unix seconds.
+               end_ts (int): The latest point to fetch data up to, in Unix seconds.
+               granularity (int): The candle interval in seconds.
+          """
+          if last_fetched > end_ts:
+               return
 
-                         yield result  
+          logger = logger_manger.get_logger(symbol)
+          logger.info("📡 Fetching historical data for %s from %s to %s with %ds granularity.", symbol, last_fetched, end_ts, granularity)
+          chunk_size = MAX_CANDLES * granularity
+          year, month = time.gmtime()[:2]
+          current_month = calendar.timegm((year, month, 1, 0, 0, 0))  # Only month precision is needed, so it is computed once
+
+          # The window reaching into the current month is the last one, the same cutoff the live data starts at
+          windows = iter(range(last_fetched, max(min(end_ts, current_month), last_fetched) + 1, chunk_size))
+          in_flight = deque()
+          failed = []  # Windows that still failed after their retries, requested once more at the end
+          try:
+               while True:
+                    for window_start in islice(windows, PREFETCH_WINDOWS - len(in_flight)):
+                         window_end = min(window_start + chunk_size - granularity, end_ts)  # Windows must not overlap
+                         in_flight.append((window_start, window_end, asyncio.create_task(
+                              CoinbaseCandleHistory.fetch_timeframe(session, symbol, window_start, window_end, granularity)
+                         )))
+
+                    if not in_flight:
+                         break
+
+                    window_start, window_end, task = in_flight.popleft()
+                    status, result = await task
 
-                         now = datetime.now(timezone.utc)
-                         if last_fetched.year == now.year and last_fetched.month == now.month:
-                              logger.info(f"🔄 Reached current month for {symbol}, switching to next coin.")
-                              finished = True
-                              break  
+                    if status is FetchStatus.NOT_FOUND:
+                         return
+
+                    if status is FetchStatus.NO_DATA:
+                         continue  # No trades within the window, there is nothing to store
+
+                    if status is not FetchStatus.OK:
+                         logger.warning("⚠️ No usable data for %s (%s), retrying window at %s at the end", symbol, status.name, window_start)
+                         failed.append((window_start, window_end))
+                         continue
 
-                         await asyncio.sleep(COINBASE_RATE_LIMIT)  
\ No newline at end of file
+                    yield result
+          finally:
+               for _, _, task in in_flight:
+                    task.cancel()  # Nothing waits for the prefetched windows anymore
+
+          missing = []
+          for window_start, window_end in failed:  # By now a rate limit or an outage has likely passed
+               status, result = await CoinbaseCandleHistory.fetch_timeframe(session, symbol, window_start, window_end, granularity)
+               if status is FetchStatus.OK:
+                    yield result
+               elif status is not FetchStatus.NO_DATA:
+                    missing.append(window_start)
+
+          if missing:
+               logger.error(
+                    "🚨 %d windows of %s could not be fetched, the first at %s, they are refetched as holes on the next run",
+                    len(missing), symbol, missing[0]
+               )
+               return
+
+          logger.info("🔄 Reached the end of the requested range for %s, switching to next coin.", symbol)
@@ -1,22 +1,38 @@
 import asyncio
 from pathlib import Path
-from coin_db import CoinDB
 from parser import Parser
-from coinbase_candle_history import CoinbaseCandleHistory
+
+try:
+     import uvloop
+except ImportError:  # uvloop is not available on Windows, winloop is its port
+     try:
+          import winloop as uvloop
+     except ImportError:
+          uvloop = None  # Fall back to the default asyncio loop
 
 async def main(symbols, start_date, end_date, granularity, dir):
-     
+     # Imported only once the arguments parsed, so --help and usage errors skip loading aiohttp, numpy, pyarrow and duckdb
+     from coin_db import CoinDB
+     from coinbase_candle_history import CoinbaseCandleHistory
+
+     db = CoinDB(Path(dir))
+
      gen = CoinbaseCandleHistory.fetch(
          symbols,  
          start_date,
          end_date,
-         granularity
+         granularity,
+         stored=db.coverage
      )
 
-     db = CoinDB(Path(dir))
-     await db.store(gen)
+     try:
+          await db.store(gen)
+     finally:
+          await CoinbaseCandleHistory.close_session()
  
 if __name__ == "__main__":
      parser = Parser()
      args = parser.parse()
+     if uvloop is not None:
+          uvloop.install()
      asyncio.run(main(*args))
\ No newline at end of file
@@ -1,6 +1,8 @@
 import argparse
 from pathlib import Path
 
+GRANULARITIES = (60, 300, 900, 3600, 21600, 86400)  # Candle intervals in seconds the Coinbase candles endpoint accepts
+
 class Parser:
      def __init__(self):
           self.parser = argparse.ArgumentParser(
@@ -35,7 +37,7 @@ class Parser:
                type=int,
                nargs="?",
                default=60,
-               choices=[60, 300, 900, 3600, 21600, 86400],
+               choices=GRANULARITIES,
                help="Granularity in seconds (default: 60). Options: 60 (1min), 300 (5min), 900 (15min), "
                     "3600 (1hr), 21600 (6hr), 86400 (1day).",
           )
@@ -53,7 +55,8 @@ class Parser:
           symbols = []
           if Path(args.name_or_file).is_file():
                with open(args.name_or_file, "r") as f:
-                    symbols = [line.strip() for line in f.readlines() if line.strip() and not line.startswith("//")]
+                    stripped = (line.strip() for line in f)  # Strips each line once and streams the file
+                    symbols = [line for line in stripped if line and not line.startswith("//")]
           elif "-USD" in args.name_or_file:
                symbols = [args.name_or_file]  # Treat as a single symbol
           else:
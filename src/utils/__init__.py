@@ -1,3 +1,4 @@
 from .algorithms import *
 from .configs import *
+from .limiters import *
 from .loggers import *
\ No newline at end of file
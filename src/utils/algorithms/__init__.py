@@ -1 +1,2 @@
-from .binary_search import *
\ No newline at end of file
+from .binary_search import *
+from .exponential_search import *
\ No newline at end of file
@@ -1,4 +1,5 @@
-from typing import Callable
+import asyncio
+from typing import Awaitable, Callable
 
 async def binary_search_first_occurrence_async(    
     condition: Callable[[int], bool], 
@@ -14,7 +15,7 @@ async def binary_search_first_occurrence_async(
         condition (Callable[[int], bool]): Function returning True when the target is found.
         start (int): Lower bound of the search range.
         end (int): Upper bound of the search range.
-        max_depth (int): Limits recursion depth to control precision.
+        max_depth (int): Limits the number of halvings to control precision.
 
     Returns:
         int: 
@@ -26,19 +27,82 @@ async def binary_search_first_occurrence_async(
     """
     if start > end:
         raise ValueError(f"Invalid range: start ({start}) is after end ({end}).")
-    
-    if max_depth == 0:
-        return -1  
-    
-    middle = (start + end) // 2  
 
-    if start == end:
-        return start if await condition(start) else -1
-    
-    if await condition(middle):
-        if middle > start and await condition(middle - 1):    # Check if the previous timestamp also has data
-            return await binary_search_first_occurrence_async(condition, start, middle - 1, max_depth - 1)
+    probed = {}  # Conditions are typically network round trips, so no point is awaited twice
+
+    async def probe(index: int) -> bool:
+        if index not in probed:
+            probed[index] = await condition(index)
+        return probed[index]
+
+    while max_depth != 0:  # Narrowed in place, a Python frame per halving costs more than a cheap condition
+        middle = (start + end) // 2
+
+        if start == end:
+            return start if await probe(start) else -1
+
+        if await probe(middle):
+            if middle > start and await probe(middle - 1):    # Check if the previous timestamp also has data
+                end = middle - 1
+            else:
+                return middle  # Found the first occurrence
         else:
-            return middle  # Found the first occurrence
-    else:
-        return await binary_search_first_occurrence_async(condition, middle + 1, end, max_depth - 1)
\ No newline at end of file
+            start = middle + 1
+
+        max_depth -= 1
+
+    return -1
+
+async def binary_search_first_occurrence_async_parallel(
+    condition: Callable[[int], Awaitable[bool]],
+    start: int,
+    end: int,
+    k_probes: int,
+    step: int = 1
+) -> int:
+    """
+    Finds the first occurrence where `condition` is True, probing `k_probes` points at once.
+
+    Each round splits the remaining range into `k_probes + 1` buckets and awaits the
+    conditions at their boundaries concurrently, narrowing the range by a factor of
+    `k_probes + 1` per round instead of 2. Worth it when a probe is a network round trip.
+
+    Args:
+        condition (Callable[[int], Awaitable[bool]]): Async function returning True when the target is found.
+        start (int): Lower bound of the search range.
+        end (int): Upper bound of the search range.
+        k_probes (int): Number of conditions awaited concurrently per round.
+        step (int): Resolution of the search, only points `start + i * step` (and `end`) are probed.
+
+    Returns:
+        int:
+            The first occurrence where `condition` is True.
+            -1 if the condition was never met.
+
+    Raises:
+        ValueError: If `start > end`, `k_probes < 1` or `step < 1`, preventing incorrect logic.
+    """
+    if start > end:
+        raise ValueError(f"Invalid range: start ({start}) is after end ({end}).")
+
+    if k_probes < 1 or step < 1:
+        raise ValueError(f"Invalid k_probes ({k_probes}) or step ({step}), both must be at least 1.")
+
+    def point(index: int) -> int:
+        return min(start + index * step, end)
+
+    low, high = 0, -(-(end - start) // step)  # Indices of the probed grid, the last one is clamped to `end`
+    first = -1
+    while low <= high:
+        size = high - low + 1
+        count = min(k_probes, size)
+        indices = sorted({low + size * (i + 1) // (count + 1) for i in range(count)})
+        results = await asyncio.gather(*(condition(point(index)) for index in indices))
+
+        for index, found in zip(indices, results):
+            if found:
+                first, high = index, index - 1
+                break
+            low = index + 1
+
+    return point(first) if first != -1 else -1
@@ -0,0 +1,59 @@
+from typing import Awaitable, Callable
+from .binary_search import binary_search_first_occurrence_async_parallel
+
+async def exponential_search_first_occurrence_async(
+    condition: Callable[[int], Awaitable[bool]],
+    start: int,
+    end: int,
+    step: int = 1,
+    k_probes: int = 1
+) -> int:
+    """
+    Finds the first occurrence where `condition` is True using exponential search.
+
+    Probes `start`, then `start + step * 2^k` for growing `k` until `condition` holds,
+    and bisects between the last failed and the first passing probe, `k_probes` points at a time. Needs O(log Δ)
+    probes, where Δ is the distance from `start` to the answer, so occurrences close
+    to `start` are found much faster than with a bisection over the whole range.
+
+    Args:
+        condition (Callable[[int], Awaitable[bool]]): Async function returning True when the target is found.
+        start (int): Lower bound of the search range.
+        end (int): Upper bound of the search range.
+        step (int): Resolution of the search, the result is the first passing point of the `start + i * step` grid (or `end`).
+        k_probes (int): Number of conditions awaited concurrently while bisecting (see `binary_search_first_occurrence_async_parallel`).
+
+    Returns:
+        int:
+            The first occurrence where `condition` is True.
+            -1 if the condition was never met.
+
+    Raises:
+        ValueError: If `start > end` or `step < 1`, preventing incorrect logic.
+    """
+    if start > end:
+        raise ValueError(f"Invalid range: start ({start}) is after end ({end}).")
+
+    if step < 1:
+        raise ValueError(f"Invalid step: {step}, must be at least 1.")
+
+    if await condition(start):
+        return start
+
+    low, offset = start, step  # condition(low) is known to be False
+    while True:
+        high = min(start + offset, end)
+        if await condition(high):
+            break
+        if high == end:
+            return -1
+        low, offset = high, offset * 2
+
+    if high - low <= step:
+        return high
+
+    # condition(high) already passed, so only the grid points strictly between the two probes are left.
+    # `high` may be clamped to `end`, so the last of them is found from `low`, which is always on the grid.
+    last = low + (high - low - 1) // step * step
+    first = await binary_search_first_occurrence_async_parallel(condition, low + step, last, k_probes, step)
+    return first if first != -1 else high
@@ -14,6 +14,7 @@ Usage Example:
     print(CONFIG.REPO_LINK)  # Retrieves the repository link
     print(CONFIG.USER_AGENT)  # Retrieves the user agent string
     print(CONFIG.CONTACT_EMAIL)  # Retrieves the contact email, or uses an environment variable fallback
+    print(CONFIG.CACHE_DIR)  # Retrieves the cache directory, "cache" by default
 
 Logging:
     - Errors related to missing or corrupted `config.json` are logged in `logs/config/confg.log`.
@@ -22,12 +23,16 @@ Logging:
 
 
 import os
-import json
+import orjson
+from functools import lru_cache
 from pathlib import Path
 import logging
 from ..loggers import LoggerManager
 
-_logger = LoggerManager(Path("logs", "config"), level=logging.WARNING).get_logger("config")
+@lru_cache(maxsize=None)
+def _get_logger() -> logging.Logger:
+    """Returns the config logger, creating its log file only once something has to be reported."""
+    return LoggerManager(Path("logs", "config"), level=logging.WARNING).get_logger("config")
 
 class _Config:
     """
@@ -48,6 +53,7 @@ class _Config:
         REPO_LINK: Retrieves the repository link from the config file.
         USER_AGENT: Retrieves the user agent string.
         CONTACT_EMAIL: Retrieves the contact email, with an optional environment variable fallback.
+        CACHE_DIR: Retrieves the directory for persisted lookups.
     """
 
     _config = None  # Lazy loading (only loads when needed)
@@ -62,10 +68,9 @@ class _Config:
         """
         if _Config._config is None:  # Ensure it's loaded only once
             try:
-                with open("config.json", "r") as _Config_file:
-                    _Config._config = json.load(_Config_file)
-            except (FileNotFoundError, json.JSONDecodeError) as e:
-                _logger.error(f"⚠️ Config file error: {e}")
+                _Config._config = orjson.loads(Path("config.json").read_bytes())
+            except (FileNotFoundError, orjson.JSONDecodeError) as e:
+                _get_logger().error(f"⚠️ Config file error: {e}")
                 _Config._config = {}  # Use empty dict if file is missing or corrupted
             
             missing = [key for key in ["version", "repo_link", "user_agent"] if not self._get(key)]
@@ -83,8 +88,11 @@ class _Config:
         Returns:
             The value associated with `key`, or `default` if the key is not found.
         """
-        self._load_config()
-        return _Config._config.get(key, default)
+        config = _Config._config
+        if config is None:  # Only the first access pays for loading, later ones are a single dict lookup
+            self._load_config()
+            config = _Config._config
+        return config.get(key, default)
 
     @property
     def VERSION(self):
@@ -106,5 +114,10 @@ class _Config:
         """Returns the contact email from `config.json`, or falls back to the `EMAIL` environment variable."""
         return self._get("email", os.getenv("EMAIL", ""))
 
+    @property
+    def CACHE_DIR(self):
+        """Returns the directory for persisted lookups (e.g. first candle of each coin) from `config.json`."""
+        return self._get("cache_dir", "cache")
+
 # Create a singleton instance of the configuration
 CONFIG = _Config()
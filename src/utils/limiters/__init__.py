@@ -0,0 +1 @@
+from .token_bucket import *
\ No newline at end of file
@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+class AsyncTokenBucket:
+    """
+    Asynchronous token bucket limiter shared by every coroutine that enters it.
+
+    Tokens refill continuously at `rate` per second up to `capacity`, so idle time
+    is spent as a burst later on. The bucket can additionally be adjusted from the
+    rate limit hints a server sends back with its responses.
+
+    Usage:
+        async with limiter:
+            response = await session.get(url)
+    """
+
+    __slots__ = ("rate", "capacity", "_tokens", "_updated", "_blocked_until")  # Entered before every request
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Args:
+            rate (float): Tokens added per second.
+            capacity (int): Maximum number of tokens the bucket can hold.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """
+        Waits until a token is available and takes it.
+        """
+        while True:
+            now = time.monotonic()
+            self._refill(now)
+            wait = self._blocked_until - now
+            if wait <= 0:
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            await asyncio.sleep(wait)
+
+    def defer(self, delay: float):
+        """
+        Holds back every request for at least `delay` seconds (e.g. after a 429 response).
+
+        Args:
+            delay (float): Seconds until the next request may be sent.
+        """
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        self._tokens = 0.0
+
+    def sync(self, remaining: float):
+        """
+        Caps the available tokens to the budget the server reports as remaining.
+
+        Args:
+            remaining (float): Requests the server still accepts in the current window.
+        """
+        self._refill(time.monotonic())
+        self._tokens = min(self._tokens, max(remaining, 0.0))
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
@@ -1,15 +1,39 @@
+import atexit
 import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
+class _FileRouter(logging.Handler):
+    """Writes each record to the file handler registered for the logger that emitted it."""
+
+    def __init__(self):
+        super().__init__()
+        self._handlers = {}
+
+    def add(self, name: str, handler: logging.Handler):
+        self._handlers[name] = handler
+
+    def handle(self, record: logging.LogRecord):
+        handler = self._handlers.get(record.name)
+        if handler is not None and record.levelno >= handler.level:
+            handler.handle(record)
+
 class LoggerManager:
     """Manages loggers for different coins, ensuring logs are stored separately per coin."""
 
- 
+
     def __init__(self, dir: Path, level):
-        dir.mkdir(parents=True, exist_ok=True)
         self._dir = dir
         self._loggers = {}
         self._level = level
+        self._lock = threading.Lock()  # Only taken when a logger has to be created
+
+        # Loggers only enqueue records, the files are written by the listener thread
+        self._queue = queue.SimpleQueue()
+        self._router = _FileRouter()
+        self._listener = None  # Started with the first logger, importing a module that holds a manager stays free
 
     def get_logger(self, symbol: str) -> logging.Logger:
         """
@@ -21,24 +45,36 @@ class LoggerManager:
         Returns:
             logging.Logger: A configured logger instance.
         """
-        if symbol in self._loggers:
-            return self._loggers[symbol]
+        logger = self._loggers.get(symbol)  # Hot path, called for every request
+        if logger is not None:
+            return logger
 
-        else:
+        with self._lock:
+            logger = self._loggers.get(symbol)
+            if logger is None:  # Another thread may have created it in the meantime
+                logger = self._make_logger(symbol)
+                self._loggers[symbol] = logger
+
+        return logger
 
-            log_file = self._dir / f"{symbol}.log"
-            logger = logging.getLogger(symbol)
-            logger.setLevel(self._level)
+    def _make_logger(self, symbol: str) -> logging.Logger:
+        if self._listener is None:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            self._listener = QueueListener(self._queue, self._router)
+            self._listener.start()
+            atexit.register(self._listener.stop)  # Flushes what is still queued on exit
 
-        
-            file_handler = logging.FileHandler(log_file, mode="a")
-            file_handler.setLevel(self._level)
-            formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-            file_handler.setFormatter(formatter)
+        log_file = self._dir / f"{symbol}.log"
+        logger = logging.getLogger(symbol)
+        logger.setLevel(self._level)
 
-            logger.addHandler(file_handler)
-            self._loggers[symbol] = logger  
+        file_handler = logging.FileHandler(log_file, mode="a")
+        file_handler.setLevel(self._level)
+        formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+        file_handler.setFormatter(formatter)
+        self._router.add(symbol, file_handler)
 
+        logger.addHandler(QueueHandler(self._queue))
         return logger
 
-logger_manger = LoggerManager(Path("logs"), logging.DEBUG)
\ No newline at end of file
+logger_manger = LoggerManager(Path("logs"), logging.DEBUG)
@@ -1,7 +1,8 @@
 import pytest
 import aiohttp
+import numpy as np
 from datetime import datetime, timezone
-from src.coinbase_candle_history import CoinbaseCandleHistory
+from src.coinbase_candle_history import CoinbaseCandleHistory, FetchStatus
 
 
 @pytest.mark.asyncio
@@ -11,13 +12,14 @@ async def test_fetch_timeframe_valid():
         start_time = datetime(2024, 2, 10, 12, 0, tzinfo=timezone.utc)  # Adjust as needed
         end_time = datetime(2024, 2, 10, 13, 0, tzinfo=timezone.utc)  # 1-hour window
         
-        result = await CoinbaseCandleHistory.fetch_timeframe(
+        status, result = await CoinbaseCandleHistory.fetch_timeframe(
             session, "BTC-USDT", start_time, end_time, granularity=60
         )
+        assert status is FetchStatus.OK
         assert "symbol" in result
         assert result["symbol"] == "BTC-USDT"
         assert "data" in result
-        assert isinstance(result["data"], list)
+        assert isinstance(result["data"], np.ndarray)
         assert len(result["data"]) > 0  # Should return at least one candle
         assert len(result["data"][0]) == 6  # OHLCV format
         expected_timestamp = 1707569940   
@@ -33,9 +35,10 @@ async def test_fetch_timeframe_invalid_symbol():
         start_time = datetime(2024, 2, 10, 12, 0, tzinfo=timezone.utc)
         end_time = datetime(2024, 2, 10, 13, 0, tzinfo=timezone.utc)
         
-        result = await CoinbaseCandleHistory.fetch_timeframe(
+        status, result = await CoinbaseCandleHistory.fetch_timeframe(
             session, "INVALID-COIN", start_time, end_time, granularity=60
         )
+        assert status is FetchStatus.NOT_FOUND
         assert result is None  # Should return nothing for invalid symbols
 
 
@@ -46,7 +49,7 @@ async def test_fetch_continuous_mode():
         assert "symbol" in result
         assert result["symbol"] == "BTC-USDT"
         assert "data" in result
-        assert isinstance(result["data"], list)
+        assert isinstance(result["data"], np.ndarray)
         assert len(result["data"]) > 0  # Should continuously return data
 
         break  # Stop after the first yield
@@ -59,7 +62,7 @@ async def test_fetch_multiple_coins():
         assert "symbol" in result
         assert result["symbol"] in symbols  # Must be one of the requested coins
         assert "data" in result
-        assert isinstance(result["data"], list)
+        assert isinstance(result["data"], np.ndarray)
         assert len(result["data"]) > 0  # Should return at least one candle
 
         break  # Stop after first batch
@@ -71,10 +74,11 @@ async def test_fetch_invalid_granularity():
         start_time = datetime(2024, 2, 10, 12, 0, tzinfo=timezone.utc)
         end_time = datetime(2024, 2, 10, 13, 0, tzinfo=timezone.utc)
         
-        result = await CoinbaseCandleHistory.fetch_timeframe(
+        status, result = await CoinbaseCandleHistory.fetch_timeframe(
             session, "BTC-USDT", start_time, end_time, granularity=45  # Invalid granularity
         )
 
+        assert status is FetchStatus.API_FAILURE
         assert result is None  # Coinbase should reject unsupported granularities
 
 @pytest.mark.asyncio
@@ -84,12 +88,12 @@ async def test_fetch_edge_case_timeframe():
         start_time = datetime(2024, 2, 10, 12, 0, tzinfo=timezone.utc)
         end_time = datetime(2024, 2, 10, 12, 1, tzinfo=timezone.utc)  # 1-minute window
         
-        result = await CoinbaseCandleHistory.fetch_timeframe(
+        status, result = await CoinbaseCandleHistory.fetch_timeframe(
             session, "BTC-USDT", start_time, end_time, granularity=60
         )
 
         assert "data" in result
-        assert isinstance(result["data"], list)
+        assert isinstance(result["data"], np.ndarray)
         assert len(result["data"]) > 0  # Ensure we got at least 1 candle
         
         # Check that all returned candles are within the expected timeframe
@@ -106,8 +110,9 @@ async def test_fetch_404():
         start_time = datetime(2024, 2, 10, 12, 0, tzinfo=timezone.utc)
         end_time = datetime(2024, 2, 10, 13, 0, tzinfo=timezone.utc)
         
-        result = await CoinbaseCandleHistory.fetch_timeframe(
+        status, result = await CoinbaseCandleHistory.fetch_timeframe(
             session, "NONEXISTENT-COIN", start_time, end_time, granularity=60
         )
 
+        assert status is FetchStatus.NOT_FOUND
         assert result is None  # 404 should not return any data
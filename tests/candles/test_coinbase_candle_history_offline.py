@@ -0,0 +1,292 @@
+import pytest
+import asyncio
+import time
+import numpy as np
+from datetime import datetime, timezone
+import src.coinbase_candle_history as history
+from src.coinbase_candle_history import CoinbaseCandleHistory, FetchStatus
+from utils.limiters import AsyncTokenBucket
+
+
+def fake_fetch_symbol(chunks_per_symbol, rows=2):
+    """Replaces `_fetch_symbol` with a generator yielding `chunks_per_symbol` chunks of `rows` candles, without any request."""
+    async def fetch_symbol(session, symbol, start_date, end_date, granularity, stored, reseek):
+        for chunk in range(chunks_per_symbol):
+            await asyncio.sleep(0)
+            times = np.arange(chunk * rows, (chunk + 1) * rows, dtype=np.float64)
+            yield {"symbol": symbol, "data": np.column_stack([times] + [times] * 5)}
+    return fetch_symbol
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("coalesce, sizes", [(1, [2] * 5), (2, [4, 4, 2]), (5, [10]), (9, [10])])
+async def test_fetch_coalesces_chunks(monkeypatch, coalesce, sizes):
+    """Test that up to `coalesce` chunks of a coin are joined in order into one batch."""
+    monkeypatch.setattr(CoinbaseCandleHistory, "_fetch_symbol", staticmethod(fake_fetch_symbol(5)))
+
+    batches = [
+        result async for result in CoinbaseCandleHistory.fetch(["BTC-USD"], "2024-01-01", session=object(), coalesce=coalesce)
+    ]
+
+    assert [len(batch["data"]) for batch in batches] == sizes
+    assert list(np.concatenate([batch["data"] for batch in batches])[:, 0]) == list(range(10))
+
+
+@pytest.mark.asyncio
+async def test_fetch_rejects_invalid_coalesce():
+    """Test that a coalesce below 1 is refused."""
+    with pytest.raises(ValueError):
+        async for _ in CoinbaseCandleHistory.fetch(["BTC-USD"], "2024-01-01", session=object(), coalesce=0):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_fetch_stopped_early_leaves_no_pending_workers(monkeypatch):
+    """Test that closing fetch early cancels every worker, even those blocked on a full queue."""
+    monkeypatch.setattr(CoinbaseCandleHistory, "_fetch_symbol", staticmethod(fake_fetch_symbol(100)))
+    symbols = [f"COIN{i}-USD" for i in range(20)]
+
+    gen = CoinbaseCandleHistory.fetch(symbols, "2024-01-01", session=object())
+    await gen.__anext__()
+    for _ in range(10):
+        await asyncio.sleep(0)  # Let the workers fill the queue
+    await gen.aclose()
+    for _ in range(10):
+        await asyncio.sleep(0)  # Let the cancellations run
+
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+@pytest.fixture
+def cache_dir(monkeypatch, tmp_path):
+    """Points CONFIG.CACHE_DIR at a temporary directory."""
+    monkeypatch.setattr(type(history.CONFIG), "CACHE_DIR", property(lambda self: str(tmp_path)))
+    return tmp_path
+
+
+def test_first_timestamp_cache_round_trip(cache_dir):
+    """Test that a saved first timestamp is loaded back, and that missing or corrupted entries read as None."""
+    assert history._load_first_timestamp("BTC-USD") is None
+
+    history._save_first_timestamp("BTC-USD", 1437350400)
+    assert history._load_first_timestamp("BTC-USD") == 1437350400
+
+    (cache_dir / "ETH-USD.firstts").write_text("not a timestamp")
+    assert history._load_first_timestamp("ETH-USD") is None
+
+
+def test_failed_save_leaves_no_temp_file(cache_dir, monkeypatch):
+    """Test that a save failing before the replace removes its temporary file and keeps the old value."""
+    history._save_first_timestamp("BTC-USD", 1)
+
+    def fail(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(history.os, "replace", fail)
+
+    with pytest.raises(OSError):
+        history._save_first_timestamp("BTC-USD", 2)
+    assert [path.name for path in cache_dir.iterdir()] == ["BTC-USD.firstts"]
+    assert history._load_first_timestamp("BTC-USD") == 1
+
+
+def fake_candles(first, requests, failing=None, failure=FetchStatus.TIMEOUT):
+    """
+    Replaces the product and candle endpoints with ones that have data from `first` onwards, counting requests.
+    A probe of the `failing` window returns `failure` instead, as if its retries ran out.
+    """
+    async def fetch_product(session, symbol):
+        requests.append("product")
+        return FetchStatus.OK, {}
+
+    async def fetch_timeframe(session, symbol, start_time, end_time=None, granularity=60):
+        requests.append(start_time)
+        if start_time == failing:
+            return failure, None
+        return (FetchStatus.OK, {"symbol": symbol}) if start_time >= first else (FetchStatus.NO_DATA, None)
+
+    return staticmethod(fetch_product), staticmethod(fetch_timeframe)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("reseek", [False, True])
+async def test_seek_first_uses_cache_unless_reseek(cache_dir, monkeypatch, reseek):
+    """Test that a cached first candle is used without a single request, and that reseek searches and saves again."""
+    start, step = 1_600_000_000, history.MAX_CANDLES * 60
+    first = start + 7 * step
+    requests = []
+    fetch_product, fetch_timeframe = fake_candles(first, requests)
+    monkeypatch.setattr(CoinbaseCandleHistory, "fetch_product", fetch_product)
+    monkeypatch.setattr(CoinbaseCandleHistory, "fetch_timeframe", fetch_timeframe)
+    history._save_first_timestamp("BTC-USD", start + 3 * step)  # Stale value, only trusted without reseek
+
+    found = await CoinbaseCandleHistory._seek_first(object(), "BTC-USD", start, start + 100 * step, reseek)
+
+    if reseek:
+        assert found == first
+        assert requests
+        assert history._load_first_timestamp("BTC-USD") == first
+    else:
+        assert found == start + 3 * step
+        assert requests == []
+
+
+def fake_ranges(monkeypatch, first_available):
+    """Replaces the seek with one finding `first_available` and records the ranges fetched instead of requesting them."""
+    ranges = []
+
+    async def seek_first(session, symbol, start_ts, end_ts, reseek=False):
+        return first_available
+
+    async def fetch_range(session, symbol, last_fetched, end_ts, granularity):
+        ranges.append((last_fetched, end_ts))
+        yield {"symbol": symbol, "data": np.zeros((1, 6))}
+
+    monkeypatch.setattr(CoinbaseCandleHistory, "_seek_first", staticmethod(seek_first))
+    monkeypatch.setattr(CoinbaseCandleHistory, "_fetch_range", staticmethod(fetch_range))
+    return ranges
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("first_available, head", [(None, []), (1_600_000_000, [(1_600_000_000, 1_600_006_000 - 60)])])
+async def test_fetch_symbol_fills_head_holes_and_tail(monkeypatch, first_available, head):
+    """Test that stored candles are completed with the head, every hole and the tail, even when no head is found."""
+    ranges = fake_ranges(monkeypatch, first_available)
+    start, end = datetime.fromtimestamp(1_590_000_000, timezone.utc), datetime.fromtimestamp(1_700_000_000, timezone.utc)
+    stored = (1_600_006_000, 1_650_000_000, [(1_610_000_000, 1_620_000_000)])
+
+    results = [r async for r in CoinbaseCandleHistory._fetch_symbol(object(), "BTC-USD", start, end, 60, stored)]
+
+    assert ranges == [*head, (1_610_000_000, 1_620_000_000), (1_650_000_060, 1_700_000_000)]
+    assert len(results) == len(ranges)
+
+
+@pytest.mark.asyncio
+async def test_fetch_symbol_clips_holes_to_the_requested_range(monkeypatch):
+    """Test that only the parts of holes within the requested range are fetched."""
+    ranges = fake_ranges(monkeypatch, None)
+    start, end = datetime.fromtimestamp(1_615_000_000, timezone.utc), datetime.fromtimestamp(1_660_000_000, timezone.utc)
+    stored = (1_600_000_000, 1_650_000_000, [(1_605_000_000, 1_606_000_000), (1_610_000_000, 1_620_000_000)])
+
+    [r async for r in CoinbaseCandleHistory._fetch_symbol(object(), "BTC-USD", start, end, 60, stored)]
+
+    assert ranges == [(1_615_000_000, 1_620_000_000), (1_650_000_060, 1_660_000_000)]
+
+
+def flaky_windows(monkeypatch, failures):
+    """Replaces the candle endpoint with one failing each window start of `failures` as often as given there."""
+    requests = []
+
+    async def fetch_timeframe(session, symbol, start_time, end_time=None, granularity=60):
+        requests.append(start_time)
+        if failures.get(start_time, 0):
+            failures[start_time] -= 1
+            return FetchStatus.TIMEOUT, None
+        return FetchStatus.OK, {"symbol": symbol, "data": np.full((1, 6), start_time, dtype=np.float64)}
+
+    monkeypatch.setattr(CoinbaseCandleHistory, "fetch_timeframe", staticmethod(fetch_timeframe))
+    return requests
+
+
+@pytest.mark.asyncio
+async def test_fetch_range_retries_failed_windows_at_the_end(monkeypatch, caplog):
+    """Test that a window failing after its retries is requested again once the other windows are done."""
+    start, chunk = 1_600_000_000, history.MAX_CANDLES * 60
+    requests = flaky_windows(monkeypatch, {start + chunk: 1})
+
+    results = [r async for r in CoinbaseCandleHistory._fetch_range(object(), "BTC-USD", start, start + 3 * chunk - 60, 60)]
+
+    assert [r["data"][0, 0] for r in results] == [start, start + 2 * chunk, start + chunk]
+    assert requests.count(start + chunk) == 2
+    assert "Reached the end" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_fetch_range_reports_windows_failing_again(monkeypatch, caplog):
+    """Test that a window failing on its second chance too is reported instead of the range counting as complete."""
+    start, chunk = 1_600_000_000, history.MAX_CANDLES * 60
+    flaky_windows(monkeypatch, {start + chunk: 2})
+
+    results = [r async for r in CoinbaseCandleHistory._fetch_range(object(), "BTC-USD", start, start + 3 * chunk - 60, 60)]
+
+    assert [r["data"][0, 0] for r in results] == [start, start + 2 * chunk]
+    assert any(record.levelname == "ERROR" for record in caplog.records)
+    assert "Reached the end" not in caplog.text
+
+
+def test_request_timeout_does_not_bound_the_pool_wait():
+    """Test that only the handshake has its own timeout, waiting for a pooled connection falls under the total."""
+    assert history.REQUEST_TIMEOUT.connect is None
+    assert history.REQUEST_TIMEOUT.sock_connect == history.CONNECT_TIMEOUT
+    assert history.REQUEST_TIMEOUT.total == history.TIMEOUT
+
+
+class FakeResponse:
+    """Stands in for an aiohttp response, only the parts read by `_apply_rate_limit_headers`."""
+    def __init__(self, headers, status=200):
+        self.headers = headers
+        self.status = status
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    """Replaces the shared RATE_LIMITER with a fresh bucket."""
+    bucket = AsyncTokenBucket(history.COINBASE_RATE_LIMIT, history.COINBASE_BURST)
+    monkeypatch.setattr(history, "RATE_LIMITER", bucket)
+    return bucket
+
+
+def deferred_for(bucket):
+    """Returns the seconds `bucket` still holds requests back for."""
+    return bucket._blocked_until - time.monotonic()
+
+
+def test_remaining_header_caps_tokens(limiter):
+    """Test that the remaining budget reported by Coinbase caps the local tokens."""
+    CoinbaseCandleHistory._apply_rate_limit_headers(FakeResponse({"CB-RATELIMIT-REMAINING": "3"}))
+    assert limiter._tokens == 3
+    assert deferred_for(limiter) < 0
+
+
+@pytest.mark.parametrize("reset, expected", [("5", 5), (None, 7), ("100000", history.MAX_BACKOFF), ("-3", 0)])
+def test_reset_header_defers_when_spent(limiter, reset, expected):
+    """Test that a spent budget waits for the reset, given as seconds or as an epoch, capped to MAX_BACKOFF."""
+    reset = reset if reset is not None else str(time.time() + 7)  # Epoch form
+    CoinbaseCandleHistory._apply_rate_limit_headers(FakeResponse({"RateLimit-Remaining": "0", "RateLimit-Reset": reset}))
+    assert deferred_for(limiter) == pytest.approx(expected, abs=0.5)
+
+
+def test_epoch_reset_in_the_past_does_not_block(limiter):
+    """Test that a reset moment already passed holds nothing back."""
+    headers = {"CB-RATELIMIT-REMAINING": "0", "CB-RATELIMIT-RESET": str(time.time() - 30)}
+    CoinbaseCandleHistory._apply_rate_limit_headers(FakeResponse(headers))
+    assert deferred_for(limiter) <= 0
+
+
+@pytest.mark.parametrize("headers, expected", [({"Retry-After": "4"}, 4), ({}, history.RETRY_AFTER_DEFAULT), ({"Retry-After": "86400"}, history.MAX_BACKOFF)])
+def test_retry_after_on_429(limiter, headers, expected):
+    """Test that a 429 waits for Retry-After, the default without one, and never longer than MAX_BACKOFF."""
+    CoinbaseCandleHistory._apply_rate_limit_headers(FakeResponse(headers, status=429))
+    assert deferred_for(limiter) == pytest.approx(expected, abs=0.5)
+
+
+def test_retry_after_http_date_is_ignored(limiter):
+    """Test that a Retry-After HTTP date leaves pacing to the bucket instead of raising."""
+    CoinbaseCandleHistory._apply_rate_limit_headers(FakeResponse({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, status=429))
+    assert deferred_for(limiter) < 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("failure", [FetchStatus.TIMEOUT, FetchStatus.SERVER_ERROR, FetchStatus.RATE_LIMITED, FetchStatus.API_FAILURE])
+async def test_seek_first_failed_probe_caches_nothing(cache_dir, monkeypatch, failure):
+    """Test that a probe failing after its retries aborts the search instead of being taken for a window without data."""
+    start, step = 1_600_000_000, history.MAX_CANDLES * 60
+    requests = []
+    fetch_product, fetch_timeframe = fake_candles(start + 7 * step, requests, failing=start + 4 * step, failure=failure)
+    monkeypatch.setattr(CoinbaseCandleHistory, "fetch_product", fetch_product)
+    monkeypatch.setattr(CoinbaseCandleHistory, "fetch_timeframe", fetch_timeframe)
+
+    found = await CoinbaseCandleHistory._seek_first(object(), "BTC-USD", start, start + 100 * step, reseek=True)
+
+    assert found is None
+    assert start + 4 * step in requests
+    assert history._load_first_timestamp("BTC-USD") is None
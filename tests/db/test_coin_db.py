@@ -0,0 +1,134 @@
+import pytest
+import numpy as np
+import pyarrow as pa
+from deltalake import write_deltalake
+from datetime import datetime, timezone
+from src.coin_db import CoinDB, GAP_CANDLES
+
+T = 1707566400  # 2024-02-10 12:00 UTC
+
+
+def candles(*times):
+    """Builds an (N, 6) batch in the fetcher layout, every price and the volume equal to the candle's minute offset."""
+    return np.array([[t, *([(t - T) / 60] * 5)] for t in times], dtype=np.float64)
+
+
+async def batches(*items):
+    for data in items:
+        yield {"symbol": "BTC-USD", "data": data}
+
+
+@pytest.mark.asyncio
+async def test_query_returns_stored_candles(tmp_path):
+    """Test that stored candles come back in time order with every column."""
+    db = CoinDB(tmp_path)
+    await db.store(batches(candles(T + 120, T + 60, T)))
+
+    start = datetime(2024, 2, 10, 11, 0, tzinfo=timezone.utc)
+    end = datetime(2024, 2, 10, 13, 0, tzinfo=timezone.utc)
+    df = db.query("BTC-USD", start, end)
+
+    assert list(df["time"]) == [T, T + 60, T + 120]
+    assert list(df["close"]) == [0.0, 1.0, 2.0]
+    assert {"low", "high", "open", "volume", "timestamp", "year", "month"} <= set(df.columns)
+
+
+@pytest.mark.asyncio
+async def test_query_projects_columns(tmp_path):
+    """Test that only the requested columns are returned."""
+    db = CoinDB(tmp_path)
+    await db.store(batches(candles(T, T + 60)))
+
+    df = db.query("BTC-USD", "2024-02-10", "2024-02-11", columns=["time", "close"])
+
+    assert list(df.columns) == ["time", "close"]
+    assert list(df["time"]) == [T, T + 60]
+
+
+def test_query_rejects_bad_columns(tmp_path):
+    """Test that unknown or no columns are refused before anything is read."""
+    db = CoinDB(tmp_path)
+
+    with pytest.raises(ValueError):
+        db.query("BTC-USD", "2024-02-10", "2024-02-11", columns=["time", "price; DROP"])
+    with pytest.raises(ValueError):
+        db.query("BTC-USD", "2024-02-10", "2024-02-11", columns=[])
+
+
+@pytest.mark.asyncio
+async def test_stored_range(tmp_path):
+    """Test that the stored range spans the oldest and newest candles, and is None for unknown coins."""
+    db = CoinDB(tmp_path)
+    assert db.stored_range("BTC-USD") is None
+
+    await db.store(batches(candles(T + 60, T), candles(T + 180)))
+
+    assert db.stored_range("BTC-USD") == (T, T + 180)
+
+
+@pytest.mark.asyncio
+async def test_coverage_reports_holes(tmp_path):
+    """Test that runs of GAP_CANDLES missing candles are reported as holes, shorter ones are not."""
+    db = CoinDB(tmp_path)
+    assert db.coverage("BTC-USD", 60) is None
+
+    after_hole = T + 180 + 60 * (GAP_CANDLES + 1)  # Exactly GAP_CANDLES candles missing
+    await db.store(batches(candles(T, T + 60, T + 180, after_hole, after_hole + 60)))
+
+    assert db.coverage("BTC-USD", 60) == (T, after_hole + 60, [(T + 240, after_hole - 60)])
+
+
+@pytest.mark.asyncio
+async def test_coverage_rejects_other_granularity(tmp_path):
+    """Test that completing a table with candles of another granularity is refused."""
+    db = CoinDB(tmp_path)
+    await db.store(batches(candles(T, T + 60, T + 120)))
+
+    with pytest.raises(ValueError):
+        db.coverage("BTC-USD", 3600)
+    with pytest.raises(ValueError):
+        db.coverage("BTC-USD", 30)
+
+
+@pytest.mark.asyncio
+async def test_store_skips_candles_already_stored(tmp_path):
+    """Test that a candle repeated within a flush or across flushes is written only once."""
+    db = CoinDB(tmp_path, flush_rows=3)
+    await db.store(batches(candles(T + 120, T + 60, T), candles(T + 180, T + 120, T + 180)))
+
+    df = db.query("BTC-USD", "2024-02-10", "2024-02-11", columns=["time"])
+
+    assert list(df["time"]) == [T, T + 60, T + 120, T + 180]
+
+
+@pytest.mark.asyncio
+async def test_store_nothing_new(tmp_path):
+    """Test that storing only known candles again leaves the table unchanged."""
+    db = CoinDB(tmp_path)
+    await db.store(batches(candles(T, T + 60)))
+    await db.store(batches(candles(T + 60, T)))
+
+    assert len(db.query("BTC-USD", "2024-02-10", "2024-02-11")) == 2
+
+
+def test_legacy_monthly_tables_are_migrated(tmp_path):
+    """Test that tables of the old SYMBOL/YYYY/MM.parquet layout are moved into the partitioned table."""
+    times = [T, T + 60]
+    legacy = pa.Table.from_pydict(
+        {
+            "time": times,
+            "low": [1.0, 2.0],
+            "high": [1.0, 2.0],
+            "open": [1.0, 2.0],
+            "close": [1.0, 2.0],
+            "volume": [1.0, 2.0],
+            "timestamp": [datetime.fromtimestamp(t, tz=timezone.utc) for t in times]
+        }
+    )
+    write_deltalake(str(tmp_path / "BTC-USD" / "2024" / "02.parquet"), legacy, mode="append")
+
+    db = CoinDB(tmp_path)
+
+    assert not (tmp_path / "BTC-USD" / "2024").exists()
+    assert db.stored_range("BTC-USD") == (T, T + 60)
+    assert list(db.query("BTC-USD", "2024-02-10", "2024-02-11")["close"]) == [1.0, 2.0]
@@ -0,0 +1,88 @@
+import pytest
+import random
+from utils.algorithms.binary_search import (
+    binary_search_first_occurrence_async,
+    binary_search_first_occurrence_async_parallel
+)
+from utils.algorithms.exponential_search import exponential_search_first_occurrence_async
+
+
+def threshold_condition(threshold, probes):
+    """Builds an async condition passing from `threshold` onwards, recording every probed point in `probes`."""
+    async def condition(point):
+        probes.append(point)
+        return point >= threshold
+    return condition
+
+
+def grid_answer(start, end, step, threshold):
+    """Brute force: the first passing point of the `start + i * step` grid, clamped to `end`."""
+    for point in [*range(start, end, step), end]:
+        if point >= threshold:
+            return point
+    return -1
+
+
+@pytest.mark.asyncio
+async def test_binary_search_matches_brute_force():
+    """Test that the iterative binary search finds the first passing point without probing twice."""
+    rng = random.Random(0)
+    for _ in range(500):
+        start = rng.randint(0, 100)
+        end = start + rng.randint(0, 200)
+        threshold = rng.randint(start - 5, end + 5)
+        probes = []
+
+        found = await binary_search_first_occurrence_async(threshold_condition(threshold, probes), start, end, max_depth=64)
+
+        expected = max(threshold, start) if threshold <= end else -1
+        assert found == expected
+        assert len(probes) == len(set(probes))
+
+
+@pytest.mark.asyncio
+async def test_binary_search_max_depth():
+    """Test that the search gives up once `max_depth` halvings are spent."""
+    assert await binary_search_first_occurrence_async(threshold_condition(900, []), 0, 1000, max_depth=2) == -1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("search", ["parallel", "exponential"])
+async def test_grid_searches_match_brute_force(search):
+    """Test that the grid searches return the first passing grid point and only ever probe grid points."""
+    rng = random.Random(1)
+    for _ in range(1000):
+        start = rng.randint(0, 100)
+        end = start + rng.randint(0, 300)
+        step = rng.randint(1, 10)
+        k_probes = rng.randint(1, 5)
+        threshold = rng.randint(start - 5, end + 5)
+        probes = []
+        condition = threshold_condition(threshold, probes)
+
+        if search == "parallel":
+            found = await binary_search_first_occurrence_async_parallel(condition, start, end, k_probes, step)
+        else:
+            found = await exponential_search_first_occurrence_async(condition, start, end, step, k_probes)
+
+        assert found == grid_answer(start, end, step, threshold)
+        assert all(point == end or (point - start) % step == 0 for point in probes)
+
+
+@pytest.mark.asyncio
+async def test_exponential_search_off_grid_clamp():
+    """Test the case where bisecting up to `high - 1` used to return a point off the grid."""
+    found = await exponential_search_first_occurrence_async(threshold_condition(51, []), 22, 1000, step=4)
+    assert found == 54
+
+
+@pytest.mark.asyncio
+async def test_searches_reject_invalid_ranges():
+    """Test that inverted ranges and non-positive steps are refused."""
+    condition = threshold_condition(0, [])
+    with pytest.raises(ValueError):
+        await binary_search_first_occurrence_async(condition, 10, 0, max_depth=8)
+    with pytest.raises(ValueError):
+        await binary_search_first_occurrence_async_parallel(condition, 0, 10, k_probes=0)
+    with pytest.raises(ValueError):
+        await exponential_search_first_occurrence_async(condition, 0, 10, step=0)
@@ -0,0 +1,52 @@
+import pytest
+import time
+from utils.limiters import AsyncTokenBucket
+
+
+async def elapsed(bucket, acquires):
+    """Returns the seconds `acquires` consecutive acquisitions of `bucket` took."""
+    began = time.monotonic()
+    for _ in range(acquires):
+        await bucket.acquire()
+    return time.monotonic() - began
+
+
+@pytest.mark.asyncio
+async def test_burst_is_served_immediately():
+    """Test that a full bucket hands out `capacity` tokens without waiting."""
+    bucket = AsyncTokenBucket(rate=1, capacity=5)
+    assert await elapsed(bucket, 5) < 0.05
+
+
+@pytest.mark.asyncio
+async def test_refill_rate_paces_requests():
+    """Test that once the burst is spent tokens arrive at `rate` per second."""
+    bucket = AsyncTokenBucket(rate=50, capacity=1)
+    await bucket.acquire()
+    assert await elapsed(bucket, 5) >= 0.09  # 5 tokens at 50 per second, with some leeway for the clock
+
+
+@pytest.mark.asyncio
+async def test_defer_blocks_until_delay():
+    """Test that defer holds back the next request even while tokens would be available."""
+    bucket = AsyncTokenBucket(rate=1000, capacity=10)
+    bucket.defer(0.1)
+    assert await elapsed(bucket, 1) >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_sync_caps_tokens_to_remaining():
+    """Test that sync drops the local budget to what the server reports as remaining."""
+    bucket = AsyncTokenBucket(rate=20, capacity=10)
+    bucket.sync(1)
+    assert await elapsed(bucket, 1) < 0.03  # The one remaining token is spent immediately
+    assert await elapsed(bucket, 1) >= 0.04  # The next one has to be refilled
+
+
+@pytest.mark.asyncio
+async def test_context_manager_takes_a_token():
+    """Test that entering the bucket acquires a token."""
+    bucket = AsyncTokenBucket(rate=1, capacity=1)
+    async with bucket:
+        pass
+    assert bucket._tokens < 1